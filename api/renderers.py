@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+import orjson
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively (mirrors DRF's JSONEncoder)."""
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """DRF renderer backed by orjson.
+
+    Notes:
+        Numpy arrays/scalars are serialized natively and NaN becomes `null`, so
+        payloads built from DataFrames need no Python-level pre-conversion.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        option = _ORJSON_OPTIONS
+        if (renderer_context or {}).get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_orjson_default, option=option)
@@ -1,11 +1,152 @@
+import math
 from datetime import date
+from functools import lru_cache
 
+from django.utils.dateparse import parse_date
 from rest_framework import serializers
+from rest_framework.fields import empty
+
+# Sentinel returned by fast-path coercers when the raw value needs DRF's full validation.
+_FAST_MISS = object()
+
+
+def _coerce_int(field, raw: str):
+    # DRF caps the input length (and int() refuses >4300 digits); leave long input to it.
+    if len(raw) > field.MAX_STRING_LENGTH or not raw.isascii() or not raw.isdigit():
+        return _FAST_MISS
+    return int(raw)
+
+
+def _coerce_float(field, raw: str):
+    try:
+        value = float(raw)
+    except ValueError:
+        return _FAST_MISS
+    return value if math.isfinite(value) else _FAST_MISS
+
+
+def _coerce_bool(field, raw: str):
+    # Exact membership only; any other spelling (e.g. "tRuE") is left to DRF's own parsing.
+    if raw in field.TRUE_VALUES:
+        return True
+    if raw in field.FALSE_VALUES:
+        return False
+    return _FAST_MISS
+
+
+def _coerce_choice(field, raw: str):
+    return field.choice_strings_to_values.get(raw, _FAST_MISS)
+
+
+def _coerce_char(field, raw: str):
+    value = raw.strip()
+    if not value and not field.allow_blank:
+        return _FAST_MISS
+    # Field validators (NUL/surrogate characters, length limits) report through DRF.
+    try:
+        field.run_validators(value)
+    except serializers.ValidationError:
+        return _FAST_MISS
+    return value
+
+
+def _coerce_date(field, raw: str):
+    try:
+        parsed = parse_date(raw)
+    except ValueError:
+        return _FAST_MISS
+    return _FAST_MISS if parsed is None else parsed
+
+
+_FAST_COERCERS = (
+    (serializers.BooleanField, _coerce_bool),
+    (serializers.ChoiceField, _coerce_choice),
+    (serializers.IntegerField, _coerce_int),
+    (serializers.FloatField, _coerce_float),
+    (serializers.DateField, _coerce_date),
+    (serializers.CharField, _coerce_char),
+)
+
+
+@lru_cache(maxsize=None)
+def _field_specs(serializer_class) -> tuple[dict, dict, tuple, object]:
+    """Build the fast-path field table for a query serializer class.
+
+    Args:
+        serializer_class: A `StockQuerySerializer` (sub)class.
+    Returns:
+        `(specs, static_defaults, callable_defaults, validator)`: `specs` maps each
+        field name to `(field, coerce, default, min_value, max_value)`; the defaults
+        are pre-split so absent params cost nothing per request; `validator` is a
+        reusable instance for the stateless cross-field `validate()`. Everything is
+        derived from the declared DRF fields, so the serializer stays the single
+        source of truth.
+    """
+    validator = serializer_class()
+    specs: dict = {}
+    static_defaults: dict = {}
+    callable_defaults: list = []
+    for name, field in validator.fields.items():
+        coerce = next(fn for field_type, fn in _FAST_COERCERS if isinstance(field, field_type))
+        default = field.default
+        specs[name] = (
+            field,
+            coerce,
+            default,
+            getattr(field, "min_value", None),
+            getattr(field, "max_value", None),
+        )
+        if default is empty:
+            continue
+        if callable(default):
+            callable_defaults.append((name, default))
+        else:
+            static_defaults[name] = default
+    return specs, static_defaults, tuple(callable_defaults), validator
+
+
+@lru_cache(maxsize=256)
+def _parse_ensemble_pairs_cached(raw: str) -> tuple[tuple[int, int], ...]:
+    """Parse and validate an `ensemble_pairs` string such as "5:20,10:50".
+
+    Args:
+        raw: Stripped query value.
+    Returns:
+        De-duplicated `(short, long)` pairs in input order; empty for blank input.
+    Raises:
+        ValueError: If the string is malformed (`lru_cache` never caches exceptions).
+    """
+    if not raw:
+        return ()
+    pairs: list[tuple[int, int]] = []
+    for part in raw.split(","):
+        token = part.strip()
+        if not token:
+            continue
+        if ":" not in token:
+            raise ValueError("ensemble_pairs must be like '5:20,10:50'")
+        left, right = token.split(":", 1)
+        try:
+            short_w = int(left)
+            long_w = int(right)
+        except ValueError as e:
+            raise ValueError("ensemble_pairs must contain integer windows") from e
+        if short_w < 1 or long_w < 1:
+            raise ValueError("ensemble_pairs windows must be >= 1")
+        if short_w >= long_w:
+            raise ValueError("ensemble_pairs requires short < long for each pair")
+        if short_w > 2000 or long_w > 2000:
+            raise ValueError("ensemble_pairs windows must be <= 2000")
+        pairs.append((short_w, long_w))
+
+    if len(pairs) > 12:
+        raise ValueError("ensemble_pairs supports up to 12 pairs")
+    return tuple(dict.fromkeys(pairs))
 
 
 class StockQuerySerializer(serializers.Serializer):
     code = serializers.CharField(required=False, default="AAPL")
-    start_date = serializers.DateField(required=False)
+    start_date = serializers.DateField(required=False, default=None, allow_null=True)
     end_date = serializers.DateField(required=False, default=date.today)
     short_window = serializers.IntegerField(required=False, default=5, min_value=1, max_value=500)
     long_window = serializers.IntegerField(required=False, default=20, min_value=1, max_value=500)
@@ -43,43 +184,64 @@ class StockQuerySerializer(serializers.Serializer):
 
     @staticmethod
     def _parse_ensemble_pairs(value: str) -> list[tuple[int, int]]:
-        raw = (value or "").strip()
-        if not raw:
-            return []
-        pairs: list[tuple[int, int]] = []
-        for part in raw.split(","):
-            token = part.strip()
-            if not token:
+        try:
+            return list(_parse_ensemble_pairs_cached((value or "").strip()))
+        except ValueError as e:
+            raise serializers.ValidationError(str(e)) from e
+
+    @classmethod
+    def parse_query(cls, query_params) -> dict:
+        """Validate query params with a fast path that bypasses DRF field machinery.
+
+        Args:
+            query_params: The request `QueryDict` (or any mapping with `.get`).
+        Returns:
+            The validated params dict, equivalent to `serializer.validated_data`.
+        Raises:
+            ValidationError: Via the regular DRF path when any value is invalid.
+        Notes:
+            Only canonical inputs (e.g. `short_window=5`, `include_meta=true`) are
+            handled inline; anything else falls back to a full `is_valid()` run so
+            error payloads stay identical to DRF's.
+        """
+        specs, static_defaults, callable_defaults, validator = _field_specs(cls)
+        attrs = dict(static_defaults)
+        for name, default in callable_defaults:
+            attrs[name] = default()
+
+        # Only params actually present are coerced; unknown keys are ignored, as in DRF.
+        for name in query_params:
+            spec = specs.get(name)
+            if spec is None:
                 continue
-            if ":" not in token:
-                raise serializers.ValidationError("ensemble_pairs must be like '5:20,10:50'")
-            left, right = token.split(":", 1)
-            try:
-                short_w = int(left)
-                long_w = int(right)
-            except ValueError as e:
-                raise serializers.ValidationError("ensemble_pairs must contain integer windows") from e
-            if short_w < 1 or long_w < 1:
-                raise serializers.ValidationError("ensemble_pairs windows must be >= 1")
-            if short_w >= long_w:
-                raise serializers.ValidationError("ensemble_pairs requires short < long for each pair")
-            if short_w > 2000 or long_w > 2000:
-                raise serializers.ValidationError("ensemble_pairs windows must be <= 2000")
-            pairs.append((short_w, long_w))
-
-        if not pairs:
-            return []
-        if len(pairs) > 12:
-            raise serializers.ValidationError("ensemble_pairs supports up to 12 pairs")
-
-        out: list[tuple[int, int]] = []
-        seen = set()
-        for pair in pairs:
-            if pair in seen:
+            field, coerce, default, min_value, max_value = spec
+            raw = query_params.get(name)
+            if raw is None or raw == "":
+                if raw == "" and field.allow_null:
+                    attrs[name] = "" if getattr(field, "allow_blank", False) else None
+                elif raw == "" and getattr(field, "allow_blank", False):
+                    attrs[name] = ""
                 continue
-            seen.add(pair)
-            out.append(pair)
-        return out
+
+            value = coerce(field, raw)
+            if value is _FAST_MISS:
+                return cls._parse_query_slow(query_params)
+            if min_value is not None and value < min_value:
+                return cls._parse_query_slow(query_params)
+            if max_value is not None and value > max_value:
+                return cls._parse_query_slow(query_params)
+            attrs[name] = value
+
+        try:
+            return validator.validate(attrs)
+        except serializers.ValidationError:
+            return cls._parse_query_slow(query_params)
+
+    @classmethod
+    def _parse_query_slow(cls, query_params) -> dict:
+        serializer = cls(data=query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
 
     def validate(self, attrs):
         start_date = attrs.get("start_date")
@@ -95,12 +257,15 @@ class StockQuerySerializer(serializers.Serializer):
         if not attrs.get("include_performance"):
             return attrs
 
+        # The raw `ensemble_pairs` string is left untouched; only the ensemble path parses it.
         if attrs.get("use_ensemble"):
-            attrs["ensemble_pairs"] = self._parse_ensemble_pairs(attrs.get("ensemble_pairs", ""))
-            if not attrs["ensemble_pairs"]:
+            try:
+                pairs = _parse_ensemble_pairs_cached((attrs.get("ensemble_pairs") or "").strip())
+            except ValueError as e:
+                raise serializers.ValidationError(str(e)) from e
+            if not pairs:
                 raise serializers.ValidationError("ensemble_pairs is required when use_ensemble=true")
-        else:
-            attrs["ensemble_pairs"] = []
+            attrs["_ensemble_pairs_parsed"] = pairs
 
         if attrs.get("use_adx_filter") and not attrs.get("use_regime_filter"):
             raise serializers.ValidationError("use_adx_filter requires use_regime_filter=true")
@@ -125,5 +290,5 @@ class StockQuerySerializer(serializers.Serializer):
 
 class SignalsQuerySerializer(StockQuerySerializer):
     filter_signal_type = serializers.ChoiceField(required=False, default="all", choices=["all", "BUY", "SELL"])
-    filter_limit = serializers.IntegerField(required=False, allow_null=True, min_value=1, max_value=5000)
+    filter_limit = serializers.IntegerField(required=False, default=None, allow_null=True, min_value=1, max_value=5000)
     filter_sort = serializers.ChoiceField(required=False, default="desc", choices=["asc", "desc"])
@@ -130,3 +130,176 @@ def test_stock_data_rejects_invalid_ensemble_pairs_when_enabled(client, settings
         "&ensemble_pairs=abc&end_date=2025-01-04"
     )
     assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_stock_data_maps_leading_ma_nans_to_null(client, settings, tmp_path):
+    settings.DATA_DIR = tmp_path
+    csv = (
+        "date,open,high,low,close,volume\n"
+        "2025-01-01,1,1,1,1,100\n"
+        "2025-01-02,1,1,1,2,100\n"
+        "2025-01-03,1,1,1,3,100\n"
+    )
+    (tmp_path / "AAPL.csv").write_text(csv)
+
+    resp = client.get("/api/stock-data/?code=AAPL&short_window=2&long_window=3&end_date=2025-01-03")
+    assert resp.status_code == 200
+    rows = resp.json()
+    assert rows[0] == {
+        "date": "2025-01-01",
+        "open": 1.0,
+        "high": 1.0,
+        "low": 1.0,
+        "close": 1.0,
+        "volume": 100,
+        "ma_short": None,
+        "ma_long": None,
+    }
+    assert rows[2]["ma_long"] == pytest.approx(2.0)
+
+
+def test_orjson_renderer_handles_numpy_and_nan():
+    import numpy as np
+
+    from api.renderers import ORJSONRenderer
+
+    body = ORJSONRenderer().render({"values": np.array([1.5, np.nan]), "count": np.int64(2)})
+    assert body == b'{"values":[1.5,null],"count":2}'
+
+
+@pytest.mark.django_db
+def test_stock_data_repeat_request_served_from_response_cache(client, settings, tmp_path, monkeypatch):
+    from market_data.services import StockDataService
+
+    settings.DATA_DIR = tmp_path
+    settings.API_RESPONSE_CACHE_SECONDS = 60
+    csv = (
+        "date,open,high,low,close,volume\n"
+        "2025-01-01,1,1,1,1,100\n"
+        "2025-01-02,1,1,1,2,100\n"
+        "2025-01-03,1,1,1,3,100\n"
+    )
+    (tmp_path / "AAPL.csv").write_text(csv)
+    url = "/api/stock-data/?code=AAPL&short_window=2&long_window=3&end_date=2025-01-03&include_meta=true"
+
+    first = client.get(url)
+    assert first.status_code == 200
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("cache miss")
+
+    monkeypatch.setattr(StockDataService, "get_stock_data", fail)
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second["X-Data-Status"] == first["X-Data-Status"]
+    assert second["X-Data-Refresh"] == first["X-Data-Refresh"] == "skipped"
+    assert second["X-Data-Refresh-Reason"] == first["X-Data-Refresh-Reason"] == "covered_by_local"
+
+
+@pytest.mark.django_db
+def test_stock_data_stale_request_bypasses_response_cache(client, settings, tmp_path, monkeypatch):
+    from market_data.services import StockDataService
+
+    settings.DATA_DIR = tmp_path
+    settings.API_RESPONSE_CACHE_SECONDS = 60
+    settings.AUTO_REFRESH_ON_REQUEST = True
+    csv = (
+        "date,open,high,low,close,volume\n"
+        "2025-01-01,1,1,1,1,100\n"
+        "2025-01-02,1,1,1,2,100\n"
+        "2025-01-03,1,1,1,3,100\n"
+    )
+    (tmp_path / "AAPL.csv").write_text(csv)
+    url = "/api/stock-data/?code=AAPL&short_window=2&long_window=3&end_date=2025-01-10&include_meta=true"
+
+    checks = []
+
+    def on_cooldown(cls, stock_code, *_args, **_kwargs):
+        checks.append(stock_code)
+        return False, "cooldown"
+
+    monkeypatch.setattr(StockDataService, "_should_refresh", classmethod(on_cooldown))
+    for _ in range(2):
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert resp["X-Data-Refresh-Reason"] == "cooldown"
+    assert checks == ["AAPL", "AAPL"]
+
+
+@pytest.mark.django_db
+def test_signals_endpoint_asc_sort_and_limit(client, settings, tmp_path):
+    settings.DATA_DIR = tmp_path
+    closes = [1, 2, 1, 2, 1, 10, 1, 10, 1, 10]
+    rows = "".join(f"2025-01-{d:02d},1,1,1,{c},100\n" for d, c in enumerate(closes, start=1))
+    (tmp_path / "AAPL.csv").write_text("date,open,high,low,close,volume\n" + rows)
+
+    base = "/api/signals/?code=AAPL&short_window=2&long_window=3&end_date=2025-01-10"
+    all_signals = client.get(base + "&filter_sort=asc").json()["data"]
+    assert len(all_signals) >= 3
+    dates = [s["date"] for s in all_signals]
+    assert dates == sorted(dates)
+
+    limited = client.get(base + "&filter_sort=desc&filter_limit=2").json()["data"]
+    assert [s["date"] for s in limited] == sorted(dates, reverse=True)[:2]
+
+
+@pytest.mark.django_db
+def test_signals_endpoint_filters_by_signal_type(client, settings, tmp_path):
+    settings.DATA_DIR = tmp_path
+    closes = [1, 2, 1, 2, 1, 10, 1, 10, 1, 10]
+    rows = "".join(f"2025-01-{d:02d},1,1,1,{c},100\n" for d, c in enumerate(closes, start=1))
+    (tmp_path / "AAPL.csv").write_text("date,open,high,low,close,volume\n" + rows)
+
+    resp = client.get("/api/signals/?code=AAPL&short_window=2&long_window=3&end_date=2025-01-10&filter_signal_type=SELL")
+    body = resp.json()
+    assert body["data"]
+    assert {s["signal_type"] for s in body["data"]} == {"SELL"}
+    assert body["meta"]["returned_count"] < body["meta"]["generated_count"]
+
+
+@pytest.mark.django_db
+def test_codes_endpoint_listing_refreshes_when_directory_changes(client, settings, tmp_path, monkeypatch):
+    import os
+
+    from api import views
+
+    settings.DATA_DIR = tmp_path
+    (tmp_path / "AAPL.csv").write_text("date,open,high,low,close,volume\n")
+    assert {item["code"] for item in client.get("/api/codes/").json()} == {"AAPL"}
+
+    calls = []
+    original = views._list_codes
+    monkeypatch.setattr(views, "_list_codes", lambda d: calls.append(d) or original(d))
+    assert {item["code"] for item in client.get("/api/codes/").json()} == {"AAPL"}
+    assert calls == []
+
+    (tmp_path / "MSFT.csv").write_text("date,open,high,low,close,volume\n")
+    st = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert {item["code"] for item in client.get("/api/codes/").json()} == {"AAPL", "MSFT"}
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_stock_data_json_fast_path_and_browsable_api(client, settings, tmp_path):
+    from rest_framework.response import Response
+
+    settings.DATA_DIR = tmp_path
+    settings.API_RESPONSE_CACHE_SECONDS = 0
+    rows = "".join(f"2025-01-{d:02d},1,1,1,{d},100\n" for d in range(1, 6))
+    (tmp_path / "AAPL.csv").write_text("date,open,high,low,close,volume\n" + rows)
+    url = "/api/stock-data/?code=AAPL&short_window=2&long_window=3&include_meta=true&end_date=2025-01-05"
+
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert not isinstance(resp, Response)
+    assert resp["Content-Type"] == "application/json"
+    assert resp["X-Data-Range"] == "2025-01-01,2025-01-05"
+    assert len(resp.json()["data"]) == 5
+
+    html = client.get(url, HTTP_ACCEPT="text/html")
+    assert html.status_code == 200
+    assert isinstance(html, Response)
+    assert html["X-Data-Range"] == "2025-01-01,2025-01-05"
@@ -0,0 +1,109 @@
+import pytest
+from django.http import QueryDict
+from rest_framework import serializers
+
+from api.serializers import SignalsQuerySerializer, StockQuerySerializer
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "code=MSFT&short_window=10&long_window=50&include_meta=true",
+        "code=&short_window=&end_date=2025-01-04&force_refresh=False",
+        "include_performance=1&use_ensemble=yes&ensemble_pairs=5:20,5:20&ensemble_ma_type=ema",
+        "include_performance=true&use_vol_targeting=true&target_vol=&adx_threshold=12.5",
+        "short_window=5.0&long_window=+20",
+        "unknown=1&short_window=7&short_window=8&start_date=",
+    ],
+)
+def test_parse_query_matches_drf_validation(query):
+    qp = QueryDict(query)
+    expected = StockQuerySerializer(data=qp)
+    assert expected.is_valid(), expected.errors
+    assert StockQuerySerializer.parse_query(qp) == dict(expected.validated_data)
+
+
+@pytest.mark.parametrize("raw", ["true", "True", "TRUE", "YES", "on", "0", "False", "tRuE", "yEs", "fAlSe", "nope"])
+def test_parse_query_boolean_casing_matches_drf(raw):
+    qp = QueryDict(f"include_meta={raw}")
+    expected = StockQuerySerializer(data=qp)
+    if expected.is_valid():
+        assert StockQuerySerializer.parse_query(qp) == dict(expected.validated_data)
+    else:
+        with pytest.raises(serializers.ValidationError):
+            StockQuerySerializer.parse_query(qp)
+
+
+def test_parse_query_non_canonical_boolean_uses_drf_path(monkeypatch):
+    calls = []
+    original = StockQuerySerializer._parse_query_slow.__func__
+
+    def spy(cls, query_params):
+        calls.append(query_params.get("include_meta"))
+        return original(cls, query_params)
+
+    monkeypatch.setattr(StockQuerySerializer, "_parse_query_slow", classmethod(spy))
+    StockQuerySerializer.parse_query(QueryDict("include_meta=true"))
+    assert calls == []
+    try:
+        StockQuerySerializer.parse_query(QueryDict("include_meta=tRuE"))
+    except serializers.ValidationError:
+        pass
+    assert calls == ["tRuE"]
+
+
+def test_parse_query_signals_fills_every_field_default():
+    out = SignalsQuerySerializer.parse_query(QueryDict("filter_sort=asc"))
+    assert set(out) >= set(SignalsQuerySerializer().fields)
+    assert out["filter_limit"] is None
+    assert out["start_date"] is None
+    assert out["filter_sort"] == "asc"
+    assert out["filter_signal_type"] == "all"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "short_window=0",
+        "short_window=abc",
+        "short_window=30&long_window=20",
+        pytest.param("short_window=" + "9" * 5000, id="short_window=<5000 digits>"),
+        "code=a%00b",
+    ],
+)
+def test_parse_query_invalid_input_raises_drf_error(query):
+    with pytest.raises(serializers.ValidationError):
+        StockQuerySerializer.parse_query(QueryDict(query))
+
+
+def test_parse_query_rejects_surrogates_like_drf():
+    qp = QueryDict(mutable=True)
+    qp["code"] = "a\ud800b"
+    assert not StockQuerySerializer(data=qp).is_valid()
+    with pytest.raises(serializers.ValidationError):
+        StockQuerySerializer.parse_query(qp)
+
+
+def test_parse_ensemble_pairs_dedupes_and_caches():
+    from api.serializers import _parse_ensemble_pairs_cached
+
+    _parse_ensemble_pairs_cached.cache_clear()
+    first = StockQuerySerializer._parse_ensemble_pairs("5:20, 10:50,5:20")
+    second = StockQuerySerializer._parse_ensemble_pairs("5:20, 10:50,5:20")
+    assert first == second == [(5, 20), (10, 50)]
+    assert _parse_ensemble_pairs_cached.cache_info().hits == 1
+
+    with pytest.raises(serializers.ValidationError):
+        StockQuerySerializer._parse_ensemble_pairs("20:5")
+
+
+def test_validate_stores_parsed_pairs_without_mutating_raw_string():
+    out = StockQuerySerializer.parse_query(
+        QueryDict("include_performance=true&use_ensemble=true&ensemble_pairs=5:20,10:50")
+    )
+    assert out["ensemble_pairs"] == "5:20,10:50"
+    assert out["_ensemble_pairs_parsed"] == ((5, 20), (10, 50))
+
+    basic = StockQuerySerializer.parse_query(QueryDict("ensemble_pairs=5:20"))
+    assert "_ensemble_pairs_parsed" not in basic
@@ -1,37 +1,298 @@
+import hashlib
+import os
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from typing import Optional
 
+import numpy as np
+import orjson
 import pandas as pd
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from market_data.services import StockDataService
-from strategy_engine.services import StrategyService
+from strategy_engine.services import SIGNAL_BUY, SIGNAL_SELL, StrategyService
 
+from .renderers import ORJSONRenderer
 from .serializers import SignalsQuerySerializer, StockQuerySerializer
 
 
+def _df_to_records(df: pd.DataFrame) -> list[dict]:
+    """Convert a DataFrame into JSON-ready row dicts with NaN mapped to `None`.
+
+    Args:
+        df: Frame to serialize (e.g. OHLCV + moving averages).
+    Returns:
+        One dict per row with native Python values.
+    Notes:
+        Works per column on the underlying arrays, so no object-dtype copy of the
+        whole frame is materialized (unlike `astype(object).where(...)`).
+    """
+    columns: list[list] = []
+    for col in df.columns:
+        arr = df[col].to_numpy()
+        values = arr.tolist()
+        kind = arr.dtype.kind
+        if kind in "iub":
+            # Integer/bool columns cannot hold NaN; skip the mask pass entirely.
+            columns.append(values)
+            continue
+        # NaN != NaN: a single ufunc compare for float columns, pd.isna for the rest.
+        mask = (arr != arr) if kind in "fc" else pd.isna(arr)
+        if mask.any():
+            for i in np.flatnonzero(mask).tolist():
+                values[i] = None
+        columns.append(values)
+    keys = list(df.columns)
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+# Headers replayed from a cached response. X-Data-Refresh/-Reason are deliberately not
+# stored: they describe this request's refresh check and are rebuilt on every hit.
+_CACHED_RESPONSE_HEADERS = (
+    "X-Data-Status",
+    "X-Data-Range",
+    "X-Data-Last-Updated",
+)
+_REFRESH_HEADERS = ("X-Data-Refresh", "X-Data-Refresh-Reason")
+
+
+def _response_cache_key(request, view_name: str, params: dict) -> Optional[tuple[str, str]]:
+    """Build the response-cache slot for a validated request, or `None` if not cacheable.
+
+    Args:
+        request: The DRF request (used to check the negotiated renderer).
+        view_name: Stable view identifier included in the key.
+        params: Validated query params.
+    Returns:
+        `(key, refresh_reason)`: a BLAKE2b-based cache key and the outcome of the
+        auto-refresh check for this request. The CSV path/mtime and the refresh reason
+        are part of the key, so a rewritten CSV or a change in staleness misses.
+    Notes:
+        Requests whose range would trigger an auto-refresh are never cached, so the view
+        always runs its refresh/cooldown check for them.
+    """
+    timeout = getattr(settings, "API_RESPONSE_CACHE_SECONDS", 0)
+    if timeout <= 0 or params["force_refresh"] or request.accepted_renderer.format != "json":
+        return None
+    try:
+        csv_path = StockDataService.resolve_csv_path(params["code"])
+        mtime_ns = csv_path.stat().st_mtime_ns
+        min_date, max_date = StockDataService._data_range(StockDataService.read_price_csv(csv_path))
+    except (FileNotFoundError, ValueError):
+        return None
+    wants_refresh, refresh_reason = StockDataService._refresh_check(
+        params["start_date"], params["end_date"], min_date, max_date, force_refresh=False
+    )
+    if wants_refresh:
+        return None
+    raw = orjson.dumps([view_name, str(csv_path), mtime_ns, refresh_reason, sorted(params.items())], default=str)
+    return "api_response:v2:" + hashlib.blake2b(raw, digest_size=16).hexdigest(), refresh_reason
+
+
+def _cached_response(slot: tuple[str, str]) -> Optional[HttpResponse]:
+    key, refresh_reason = slot
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    body, headers, has_refresh_headers = entry
+    resp = HttpResponse(body, content_type="application/json")
+    for name, value in headers:
+        resp[name] = value
+    if has_refresh_headers:
+        # A replayable request never attempted a refresh (see `_response_cache_key`).
+        resp["X-Data-Refresh"] = "skipped"
+        resp["X-Data-Refresh-Reason"] = refresh_reason
+    return resp
+
+
+def _cache_entry(body: bytes, headers) -> tuple[bytes, list[tuple[str, str]], bool]:
+    kept = [(name, value) for name, value in headers if name in _CACHED_RESPONSE_HEADERS]
+    has_refresh_headers = any(name in _REFRESH_HEADERS for name, _ in headers)
+    return body, kept, has_refresh_headers
+
+
+def _cache_on_render(response: Response, key: str) -> Response:
+    """Store the rendered body of a successful response under `key` once DRF renders it."""
+
+    def store(rendered):
+        if rendered.status_code != status.HTTP_200_OK:
+            return
+        headers = [(name, value) for name, value in rendered.items()]
+        cache.set(key, _cache_entry(rendered.content, headers), timeout=settings.API_RESPONSE_CACHE_SECONDS)
+
+    response.add_post_render_callback(store)
+    return response
+
+
+def _payload_response(
+    request,
+    payload,
+    *,
+    headers: Optional[dict[str, str]] = None,
+    cache_slot: Optional[tuple[str, str]] = None,
+):
+    """Return a successful payload, skipping DRF rendering for plain JSON clients.
+
+    Args:
+        request: The DRF request (content negotiation has already run).
+        payload: JSON-serializable response body.
+        headers: Extra response headers (e.g. `X-Data-*`).
+        cache_slot: Response-cache slot from `_response_cache_key`, if cacheable.
+    Returns:
+        A raw `HttpResponse` with an orjson body when the negotiated renderer is
+        `ORJSONRenderer` without indentation; otherwise a DRF `Response` so the
+        browsable API keeps working.
+    """
+    headers = headers or {}
+    if isinstance(request.accepted_renderer, ORJSONRenderer) and "indent" not in (request.accepted_media_type or ""):
+        body = request.accepted_renderer.render(payload)
+        resp = HttpResponse(body, content_type=ORJSONRenderer.media_type)
+        for name, value in headers.items():
+            resp[name] = value
+        if cache_slot:
+            cache.set(
+                cache_slot[0],
+                _cache_entry(body, list(headers.items())),
+                timeout=settings.API_RESPONSE_CACHE_SECONDS,
+            )
+        return resp
+
+    resp = Response(payload)
+    for name, value in headers.items():
+        resp[name] = value
+    if cache_slot:
+        _cache_on_render(resp, cache_slot[0])
+    return resp
+
+
+# Research-mode execution assumptions shared by every performance run.
+_FIXED_PERF_KWARGS = {
+    "initial_capital": 100,
+    "fee_rate": 0.001,
+    "slippage_rate": 0.0005,
+    "allow_fractional": True,
+}
+# Static head of meta["assumptions"]; key order matches the published payload.
+_BASE_ASSUMPTIONS = MappingProxyType(
+    {
+        "mode": "research",
+        "fill": "next_open",
+        **_FIXED_PERF_KWARGS,
+        "price_adjusted": False,
+    }
+)
+# Validated params passed through to calculate_performance under the same name.
+_PERF_PARAM_KEYS = (
+    "use_ensemble",
+    "ensemble_ma_type",
+    "use_regime_filter",
+    "regime_ma_window",
+    "use_adx_filter",
+    "adx_window",
+    "adx_threshold",
+    "use_vol_targeting",
+    "target_vol_annual",
+    "trading_days_per_year",
+    "vol_window",
+    "max_leverage",
+    "min_vol_floor",
+    "use_chandelier_stop",
+    "chandelier_k",
+    "use_vol_stop",
+    "vol_stop_atr_mult",
+)
+_FEATURE_FLAGS = (
+    "use_ensemble",
+    "use_regime_filter",
+    "use_adx_filter",
+    "use_vol_targeting",
+    "use_chandelier_stop",
+    "use_vol_stop",
+)
+# (meta key, perf_kwargs key) pairs echoed back per enabled feature group.
+_ENSEMBLE_FIELDS = (("pairs", "ensemble_pairs"), ("ma_type", "ensemble_ma_type"))
+_REGIME_FIELDS = (
+    ("use_regime_filter", "use_regime_filter"),
+    ("ma_window", "regime_ma_window"),
+    ("use_adx_filter", "use_adx_filter"),
+    ("adx_window", "adx_window"),
+    ("adx_threshold", "adx_threshold"),
+)
+_EXIT_FIELDS = (
+    ("use_chandelier_stop", "use_chandelier_stop"),
+    ("chandelier_k", "chandelier_k"),
+    ("use_vol_stop", "use_vol_stop"),
+    ("vol_stop_atr_mult", "vol_stop_atr_mult"),
+)
+
+
+def _build_assumptions(perf_kwargs: dict) -> dict:
+    """Build `meta["assumptions"]` from the kwargs passed to `calculate_performance`.
+
+    Args:
+        perf_kwargs: The exact kwargs used for the performance run.
+    Returns:
+        The assumptions block echoed to clients, including the enabled strategy features.
+    """
+    strategy: dict = {"features_enabled": {flag: bool(perf_kwargs[flag]) for flag in _FEATURE_FLAGS}}
+    if perf_kwargs["use_ensemble"]:
+        strategy["ensemble"] = {out: perf_kwargs[key] for out, key in _ENSEMBLE_FIELDS}
+    if perf_kwargs["use_regime_filter"] or perf_kwargs["use_adx_filter"]:
+        strategy["regime"] = {out: perf_kwargs[key] for out, key in _REGIME_FIELDS}
+    if perf_kwargs["use_vol_targeting"]:
+        target_vol_daily_effective, info = StrategyService.resolve_target_vol_daily(
+            target_vol_annual=perf_kwargs["target_vol_annual"],
+            target_vol_daily=perf_kwargs["target_vol_daily"],
+            trading_days_per_year=perf_kwargs["trading_days_per_year"],
+        )
+        strategy["vol_targeting"] = {
+            "target_vol_annual": info.get("target_vol_annual_effective"),
+            "target_vol_annual_input": info.get("target_vol_annual_input"),
+            "target_vol": info.get("target_vol_daily_input"),
+            "target_vol_daily_effective": target_vol_daily_effective,
+            "source": info.get("source"),
+            "trading_days_per_year": info.get("trading_days_per_year"),
+            "vol_window": perf_kwargs["vol_window"],
+            "max_leverage": perf_kwargs["max_leverage"],
+            "min_vol_floor": perf_kwargs["min_vol_floor"],
+        }
+    if perf_kwargs["use_chandelier_stop"] or perf_kwargs["use_vol_stop"]:
+        strategy["exits"] = {out: perf_kwargs[key] for out, key in _EXIT_FIELDS}
+
+    return {
+        **_BASE_ASSUMPTIONS,
+        "signal_rules": {
+            "confirm_bars": perf_kwargs["confirm_bars"],
+            "min_cross_gap": perf_kwargs["min_cross_gap"],
+        },
+        "strategy": strategy,
+    }
+
+
 class StockDataView(APIView):
     def get(self, request):
-        params = StockQuerySerializer(data=request.query_params)
-        params.is_valid(raise_exception=True)
-        stock_code = params.validated_data["code"]
-        start_date = params.validated_data.get("start_date")
-        end_date = params.validated_data.get("end_date")
-        short_window = params.validated_data["short_window"]
-        long_window = params.validated_data["long_window"]
-        include_meta = params.validated_data.get("include_meta", False)
-        force_refresh = params.validated_data.get("force_refresh", False)
-        include_performance = params.validated_data.get("include_performance", False)
-        gen_confirm_bars = params.validated_data.get("gen_confirm_bars", 0)
-        gen_min_cross_gap = params.validated_data.get("gen_min_cross_gap", 0)
-        use_ensemble = params.validated_data.get("use_ensemble", False)
-        use_regime_filter = params.validated_data.get("use_regime_filter", False)
-        use_adx_filter = params.validated_data.get("use_adx_filter", False)
-        use_vol_targeting = params.validated_data.get("use_vol_targeting", False)
-        use_chandelier_stop = params.validated_data.get("use_chandelier_stop", False)
-        use_vol_stop = params.validated_data.get("use_vol_stop", False)
+        params = StockQuerySerializer.parse_query(request.query_params)
+        cache_slot = _response_cache_key(request, "stock_data", params)
+        if cache_slot:
+            cached = _cached_response(cache_slot)
+            if cached is not None:
+                return cached
+        stock_code = params["code"]
+        start_date = params["start_date"]
+        end_date = params["end_date"]
+        short_window = params["short_window"]
+        long_window = params["long_window"]
+        include_meta = params["include_meta"]
+        force_refresh = params["force_refresh"]
+        include_performance = params["include_performance"]
+        gen_confirm_bars = params["gen_confirm_bars"]
+        gen_min_cross_gap = params["gen_min_cross_gap"]
 
         try:
             df, meta = StockDataService.get_stock_data(
@@ -57,107 +318,22 @@ class StockDataView(APIView):
         if include_performance:
             try:
                 perf_kwargs = {
-                    "initial_capital": 100,
-                    "fee_rate": 0.001,
-                    "slippage_rate": 0.0005,
-                    "allow_fractional": True,
+                    **_FIXED_PERF_KWARGS,
                     "confirm_bars": gen_confirm_bars,
                     "min_cross_gap": gen_min_cross_gap,
-                    "use_ensemble": use_ensemble,
-                    "ensemble_pairs": params.validated_data.get("ensemble_pairs", []),
-                    "ensemble_ma_type": params.validated_data.get("ensemble_ma_type", "sma"),
-                    "use_regime_filter": use_regime_filter,
-                    "regime_ma_window": params.validated_data.get("regime_ma_window", 200),
-                    "use_adx_filter": use_adx_filter,
-                    "adx_window": params.validated_data.get("adx_window", 14),
-                    "adx_threshold": params.validated_data.get("adx_threshold", 20.0),
-                    "use_vol_targeting": use_vol_targeting,
-                    "target_vol_annual": params.validated_data.get("target_vol_annual"),
-                    "target_vol_daily": params.validated_data.get("target_vol"),
-                    "trading_days_per_year": params.validated_data.get("trading_days_per_year", 252),
-                    "vol_window": params.validated_data.get("vol_window", 14),
-                    "max_leverage": params.validated_data.get("max_leverage", 1.0),
-                    "min_vol_floor": params.validated_data.get("min_vol_floor", 1e-6),
-                    "use_chandelier_stop": use_chandelier_stop,
-                    "chandelier_k": params.validated_data.get("chandelier_k", 3.0),
-                    "use_vol_stop": use_vol_stop,
-                    "vol_stop_atr_mult": params.validated_data.get("vol_stop_atr_mult", 2.0),
+                    "ensemble_pairs": list(params.get("_ensemble_pairs_parsed", ())),
+                    "target_vol_daily": params["target_vol"],
+                    **{key: params[key] for key in _PERF_PARAM_KEYS},
                 }
                 performance = StrategyService.calculate_performance(df, **perf_kwargs)
             except ValueError as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        df = df.astype(object).where(pd.notnull(df), None)
-        data = df.to_dict("records")
+        data = _df_to_records(df)
         if meta is not None:
             meta["returned_count"] = len(data)
             if include_performance:
-                meta["assumptions"] = {
-                    "mode": "research",
-                    "fill": "next_open",
-                    "initial_capital": 100,
-                    "fee_rate": 0.001,
-                    "slippage_rate": 0.0005,
-                    "allow_fractional": True,
-                    "price_adjusted": False,
-                    "signal_rules": {
-                        "confirm_bars": gen_confirm_bars,
-                        "min_cross_gap": gen_min_cross_gap,
-                    },
-                }
-                strategy_assumptions: dict = {
-                    "features_enabled": {
-                        "use_ensemble": bool(use_ensemble),
-                        "use_regime_filter": bool(use_regime_filter),
-                        "use_adx_filter": bool(use_adx_filter),
-                        "use_vol_targeting": bool(use_vol_targeting),
-                        "use_chandelier_stop": bool(use_chandelier_stop),
-                        "use_vol_stop": bool(use_vol_stop),
-                    }
-                }
-
-                if use_ensemble:
-                    strategy_assumptions["ensemble"] = {
-                        "pairs": params.validated_data.get("ensemble_pairs", []),
-                        "ma_type": params.validated_data.get("ensemble_ma_type", "sma"),
-                    }
-
-                if use_regime_filter or use_adx_filter:
-                    strategy_assumptions["regime"] = {
-                        "use_regime_filter": bool(use_regime_filter),
-                        "ma_window": params.validated_data.get("regime_ma_window", 200),
-                        "use_adx_filter": bool(use_adx_filter),
-                        "adx_window": params.validated_data.get("adx_window", 14),
-                        "adx_threshold": params.validated_data.get("adx_threshold", 20.0),
-                    }
-
-                if use_vol_targeting:
-                    target_vol_daily_effective, vol_targeting_info = StrategyService.resolve_target_vol_daily(
-                        target_vol_annual=params.validated_data.get("target_vol_annual"),
-                        target_vol_daily=params.validated_data.get("target_vol"),
-                        trading_days_per_year=params.validated_data.get("trading_days_per_year", 252),
-                    )
-                    strategy_assumptions["vol_targeting"] = {
-                        "target_vol_annual": vol_targeting_info.get("target_vol_annual_effective"),
-                        "target_vol_annual_input": vol_targeting_info.get("target_vol_annual_input"),
-                        "target_vol": vol_targeting_info.get("target_vol_daily_input"),
-                        "target_vol_daily_effective": target_vol_daily_effective,
-                        "source": vol_targeting_info.get("source"),
-                        "trading_days_per_year": vol_targeting_info.get("trading_days_per_year"),
-                        "vol_window": params.validated_data.get("vol_window", 14),
-                        "max_leverage": params.validated_data.get("max_leverage", 1.0),
-                        "min_vol_floor": params.validated_data.get("min_vol_floor", 1e-6),
-                    }
-
-                if use_chandelier_stop or use_vol_stop:
-                    strategy_assumptions["exits"] = {
-                        "use_chandelier_stop": bool(use_chandelier_stop),
-                        "chandelier_k": params.validated_data.get("chandelier_k", 3.0),
-                        "use_vol_stop": bool(use_vol_stop),
-                        "vol_stop_atr_mult": params.validated_data.get("vol_stop_atr_mult", 2.0),
-                    }
-
-                meta["assumptions"]["strategy"] = strategy_assumptions
+                meta["assumptions"] = _build_assumptions(perf_kwargs)
 
         if include_meta or include_performance:
             payload = {"data": data, "meta": meta}
@@ -165,35 +341,41 @@ class StockDataView(APIView):
                 payload["performance"] = performance
         else:
             payload = data
-        resp = Response(payload)
+        headers: dict[str, str] = {}
         if meta is not None:
-            resp["X-Data-Status"] = meta.get("data_status", "")
             data_range = meta.get("data_range", {})
-            resp["X-Data-Range"] = f"{data_range.get('min_date') or ''},{data_range.get('max_date') or ''}"
-            resp["X-Data-Last-Updated"] = meta.get("last_modified") or ""
             refresh = meta.get("refresh", {})
-            resp["X-Data-Refresh"] = refresh.get("status", "")
-            resp["X-Data-Refresh-Reason"] = refresh.get("reason", "")
-        return resp
+            headers = {
+                "X-Data-Status": meta.get("data_status", ""),
+                "X-Data-Range": f"{data_range.get('min_date') or ''},{data_range.get('max_date') or ''}",
+                "X-Data-Last-Updated": meta.get("last_modified") or "",
+                "X-Data-Refresh": refresh.get("status", ""),
+                "X-Data-Refresh-Reason": refresh.get("reason", ""),
+            }
+        return _payload_response(request, payload, headers=headers, cache_slot=cache_slot)
 
 
 class SignalView(APIView):
     def get(self, request):
-        params = SignalsQuerySerializer(data=request.query_params)
-        params.is_valid(raise_exception=True)
-        stock_code = params.validated_data["code"]
-        start_date = params.validated_data.get("start_date")
-        end_date = params.validated_data.get("end_date")
-        short_window = params.validated_data["short_window"]
-        long_window = params.validated_data["long_window"]
-        gen_confirm_bars = params.validated_data["gen_confirm_bars"]
-        gen_min_cross_gap = params.validated_data["gen_min_cross_gap"]
-        include_meta = params.validated_data.get("include_meta", False)
-        force_refresh = params.validated_data.get("force_refresh", False)
-
-        filter_signal_type = params.validated_data["filter_signal_type"]
-        filter_limit = params.validated_data.get("filter_limit")
-        filter_sort = params.validated_data["filter_sort"]
+        params = SignalsQuerySerializer.parse_query(request.query_params)
+        cache_slot = _response_cache_key(request, "signals", params)
+        if cache_slot:
+            cached = _cached_response(cache_slot)
+            if cached is not None:
+                return cached
+        stock_code = params["code"]
+        start_date = params["start_date"]
+        end_date = params["end_date"]
+        short_window = params["short_window"]
+        long_window = params["long_window"]
+        gen_confirm_bars = params["gen_confirm_bars"]
+        gen_min_cross_gap = params["gen_min_cross_gap"]
+        include_meta = params["include_meta"]
+        force_refresh = params["force_refresh"]
+
+        filter_signal_type = params["filter_signal_type"]
+        filter_limit = params["filter_limit"]
+        filter_sort = params["filter_sort"]
 
         try:
             if include_meta:
@@ -222,22 +404,32 @@ class SignalView(APIView):
 
         try:
             df = StrategyService.calculate_moving_averages(df, short_window, long_window)
-            signals = StrategyService.generate_signals(
+            signals, signal_types = StrategyService.generate_signals(
                 df,
                 confirm_bars=gen_confirm_bars,
                 min_cross_gap=gen_min_cross_gap,
+                with_types=True,
             )
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         generated_count = len(signals)
 
-        if filter_signal_type != "all":
-            signals = [s for s in signals if s["signal_type"] == filter_signal_type]
+        # Filter, sort and limit on index arrays; the dicts are only gathered once at the end.
+        if filter_signal_type == "all":
+            selected = np.arange(generated_count)
+        else:
+            target = SIGNAL_BUY if filter_signal_type == "BUY" else SIGNAL_SELL
+            selected = np.flatnonzero(signal_types == target)
 
-        signals = sorted(signals, key=lambda s: s["date"], reverse=(filter_sort == "desc"))
-        if filter_limit:
-            signals = signals[:filter_limit]
+        if selected.size:
+            dates = np.array([signals[i]["date"] for i in selected.tolist()], dtype="datetime64[D]")
+            selected = selected[np.argsort(dates, kind="stable")]
+            if filter_sort == "desc":
+                selected = selected[::-1]
+            if filter_limit:
+                selected = selected[:filter_limit]
+        signals = [signals[i] for i in selected.tolist()]
 
         meta = {
             "generated_count": generated_count,
@@ -259,7 +451,41 @@ class SignalView(APIView):
             meta["data_meta"] = data_meta
 
         payload = {"data": signals, "meta": meta}
-        return Response(payload)
+        return _payload_response(request, payload, cache_slot=cache_slot)
+
+
+# Last CodesView listing, keyed on (DATA_DIR, directory mtime). Adding, removing or
+# renaming a CSV bumps the directory mtime, which is all the listing depends on.
+_CODES_CACHE: dict = {"key": None, "items": []}
+_CODES_CACHE_LOCK = threading.Lock()
+
+
+def _list_codes(data_dir: Path) -> list[dict]:
+    # Same rule as StockDataService._validate_code, inlined to one compiled match per file.
+    is_safe_code = StockDataService._SAFE_CODE_RE.fullmatch
+    with os.scandir(data_dir) as it:
+        names = sorted(e.name for e in it if e.name.endswith(".csv") and e.is_file())
+    items: list[dict] = []
+    for name in names:
+        stem = name[:-4]
+        code = (stem[:-3] if stem.lower().endswith("_3y") else stem).strip()
+        if not code or not is_safe_code(code):
+            continue
+        items.append({"code": code, "label": code, "file": name})
+    return items
+
+
+def _cached_codes(data_dir: Path) -> list[dict]:
+    global _CODES_CACHE
+    key = (str(data_dir), data_dir.stat().st_mtime_ns)
+    cached = _CODES_CACHE
+    if cached["key"] != key:
+        with _CODES_CACHE_LOCK:
+            if _CODES_CACHE["key"] != key:
+                # Swap in a fresh dict so lock-free readers never see a torn key/items pair.
+                _CODES_CACHE = {"key": key, "items": _list_codes(data_dir)}
+            cached = _CODES_CACHE
+    return cached["items"]
 
 
 class CodesView(APIView):
@@ -275,14 +501,4 @@ class CodesView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        items: list[dict] = []
-        for csv_path in sorted(data_dir.glob("*.csv")):
-            stem = csv_path.stem
-            code = stem[:-3] if stem.lower().endswith("_3y") else stem
-            try:
-                code = StockDataService._validate_code(code)
-            except ValueError:
-                continue
-            items.append({"code": code, "label": code, "file": csv_path.name})
-
-        return Response(items)
+        return Response(_cached_codes(data_dir))
@@ -15,6 +15,10 @@ DATA_DIR = Path(os.getenv("DATA_DIR", BASE_DIR / "data"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 AUTO_REFRESH_ON_REQUEST = os.getenv("AUTO_REFRESH_ON_REQUEST", "true").lower() in {"1", "true", "yes"}
 AUTO_REFRESH_COOLDOWN_SECONDS = int(os.getenv("AUTO_REFRESH_COOLDOWN_SECONDS", "3600"))
+API_RESPONSE_CACHE_SECONDS = int(os.getenv("API_RESPONSE_CACHE_SECONDS", "300"))
+PRICE_CSV_CACHE_SECONDS = int(os.getenv("PRICE_CSV_CACHE_SECONDS", "3600"))
+PRICE_FEATHER_CACHE = os.getenv("PRICE_FEATHER_CACHE", "true").lower() in {"1", "true", "yes"}
+NUMBA_WARMUP = os.getenv("NUMBA_WARMUP", "true").lower() in {"1", "true", "yes"}
 
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -27,6 +31,7 @@ INSTALLED_APPS = [
     "corsheaders",
     "api",
     "domain",
+    "strategy_engine",
     "tooling",
 ]
 
@@ -109,6 +114,10 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("domain", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="stockprice",
+            name="domain_stoc_stock_i_86bebf_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="strategysignal",
+            name="domain_stra_stock_i_a5d7d0_idx",
+        ),
+        migrations.AddIndex(
+            model_name="stockprice",
+            index=models.Index(fields=["stock", "-date"], name="stockprice_stock_date_desc"),
+        ),
+        migrations.AddIndex(
+            model_name="strategysignal",
+            index=models.Index(fields=["stock", "-date"], name="strategysignal_stock_date_desc"),
+        ),
+    ]
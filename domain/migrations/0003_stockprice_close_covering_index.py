@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("domain", "0002_stock_date_desc_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="stockprice",
+            name="stockprice_stock_date_desc",
+        ),
+        migrations.AddIndex(
+            model_name="stockprice",
+            index=models.Index(fields=["stock", "-date"], include=("close",), name="stockprice_close_covering"),
+        ),
+    ]
@@ -54,7 +54,9 @@ class StockPrice(models.Model):
         unique_together = ("stock", "date")
         ordering = ["-date"]
         indexes = [
-            models.Index(fields=["stock", "date"]),
+            # `close` is carried in the index (PostgreSQL INCLUDE) so close-price series
+            # for one stock are served by index-only scans.
+            models.Index(fields=["stock", "-date"], include=["close"], name="stockprice_close_covering"),
         ]
 
     def __str__(self):
@@ -92,7 +94,7 @@ class StrategySignal(models.Model):
         unique_together = ("stock", "date", "short_window", "long_window")
         ordering = ["-date"]
         indexes = [
-            models.Index(fields=["stock", "date"]),
+            models.Index(fields=["stock", "-date"], name="strategysignal_stock_date_desc"),
         ]
 
     def __str__(self):
@@ -1,15 +1,166 @@
+import csv
 import logging
+import os
 import re
+import threading
+from collections import OrderedDict
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
+import requests
 from django.conf import settings
 from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as pa_feather
+except ImportError:  # pragma: no cover - pyarrow is an optional accelerator
+    pa = None
+    pacsv = None
+    pa_feather = None
 
 logger = logging.getLogger(__name__)
 
+# Shared across refreshes so Yahoo connections are kept alive instead of a new
+# TCP/TLS handshake per `yf.download` call.
+_YF_SESSION = requests.Session()
+_YF_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.3)),
+)
+
+
+_PRICE_COLUMNS = ("date", "open", "high", "low", "close", "volume")
+
+
+def _canonical_price_columns(names: list[str]) -> tuple[list[str], list[str]]:
+    """Map raw CSV header names onto the canonical OHLCV names in one pass.
+
+    Args:
+        names: Header names as read from the CSV.
+    Returns:
+        `(columns, missing)`: the relabelled header (extra columns keep their name)
+        and any required canonical names that could not be found.
+    Notes:
+        The first column is treated as the date when it is named Price/Date or when
+        no column is named date; otherwise matching is case-insensitive and the last
+        column with a given lowercased name wins.
+    """
+    columns = list(names)
+    if not columns:
+        return columns, list(_PRICE_COLUMNS)
+    lowered = [str(c).lower() for c in columns]
+    if lowered[0] in {"price", "date"} or "date" not in lowered:
+        columns[0] = "date"
+        lowered[0] = "date"
+    positions = {name: i for i, name in enumerate(lowered)}
+    missing = [k for k in _PRICE_COLUMNS if k not in positions]
+    for key in _PRICE_COLUMNS:
+        if key in positions:
+            columns[positions[key]] = key
+    return columns, missing
+
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """Parse a date column, trying the vectorized ISO 8601 parser first.
+
+    Args:
+        values: Raw date values (strings or datetime-likes).
+    Returns:
+        A datetime64 Series with NaT for unparseable values, the same result as
+        `pd.to_datetime(values, errors="coerce", format="mixed")`.
+    Notes:
+        Only when the ISO pass loses values that were present (or raises, e.g. on
+        mixed UTC offsets) is the column re-parsed with the per-value "mixed" parser.
+    """
+    try:
+        parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+        if parsed.isna().sum() == values.isna().sum():
+            return parsed
+    except (TypeError, ValueError):
+        pass
+    return pd.to_datetime(values, errors="coerce", format="mixed")
+
+
+def _sniff_price_csv(csv_path: Path) -> tuple[list[str], int]:
+    """Read just the header lines of a price CSV.
+
+    Args:
+        csv_path: CSV file to inspect.
+    Returns:
+        `(header_names, meta_rows)` where `meta_rows` is 2 for the repo layout
+        ("Price,..." header followed by "Ticker,..." and "Date,,,..." rows), else 0.
+    """
+    with open(csv_path, encoding="utf-8-sig", errors="replace", newline="") as fh:
+        head = [fh.readline() for _ in range(3)]
+    names = next(csv.reader([head[0]]), [])
+    meta_rows = 2 if [line.split(",", 1)[0].strip().lower() for line in head[1:]] == ["ticker", "date"] else 0
+    return names, meta_rows
+
+
+@lru_cache(maxsize=16)
+def _data_dir_file_names(data_dir: str, dir_mtime_ns: int) -> frozenset[str]:
+    """Return the names of regular files in `data_dir`, scanned once per directory mtime."""
+    with os.scandir(data_dir) as entries:
+        return frozenset(entry.name for entry in entries if entry.is_file())
+
+
+@lru_cache(maxsize=1024)
+def _resolve_csv_path_cached(code: str, data_dir: str, dir_mtime_ns: int) -> str:
+    """Return the first existing candidate CSV for `code`, memoized per directory mtime.
+
+    Creating, removing or renaming a file bumps the directory mtime, which is part of
+    the key. Candidates are matched against one shared directory listing; on a miss
+    they are probed on disk (which also covers case-insensitive filesystems). Misses
+    raise, and `lru_cache` never caches exceptions, so a file written within the same
+    mtime tick as a failed lookup is still found on the next call.
+    """
+    candidates = StockDataService._candidate_paths(Path(data_dir), code)
+    names = _data_dir_file_names(data_dir, dir_mtime_ns)
+    for candidate in candidates:
+        if candidate.name in names:
+            return str(candidate)
+    for candidate in candidates:
+        if candidate.is_file():
+            return str(candidate)
+    raise FileNotFoundError(f"No CSV found for code={code} in {data_dir}")
+
+
+# In-process LRU in front of the shared Django cache: a hit skips the cache round trip
+# and Arrow decode entirely. Keyed on (resolved path, mtime_ns, size) like the shared
+# entry; frames stored here are never handed out directly (callers get a copy).
+_PRICE_FRAME_MEMO: "OrderedDict[tuple[str, int, int], pd.DataFrame]" = OrderedDict()
+_PRICE_FRAME_MEMO_LOCK = threading.Lock()
+_PRICE_FRAME_MEMO_SIZE = 256
+
+
+def _frame_to_cache_value(df: pd.DataFrame):
+    """Encode a parsed price frame for the Django cache (Arrow IPC bytes when available)."""
+    if pa is None:
+        return df
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return df
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _frame_from_cache_value(value) -> pd.DataFrame:
+    if isinstance(value, pd.DataFrame):
+        return value
+    reader = pa.ipc.open_stream(pa.BufferReader(value))
+    return reader.read_pandas(split_blocks=True, self_destruct=True)
+
 
 class StockDataService:
     _SAFE_CODE_RE = re.compile(r"^[A-Za-z0-9._-]+$")
@@ -19,6 +170,10 @@ class StockDataService:
         code = (stock_code or "").strip()
         if not code:
             raise ValueError("code is required")
+        # Plain ASCII tickers (the common case) skip the regex; isalnum() alone would
+        # also accept non-ASCII letters/digits.
+        if code.isascii() and code.isalnum():
+            return code
         if not cls._SAFE_CODE_RE.fullmatch(code):
             raise ValueError("invalid code: only letters/numbers/._- are allowed")
         return code
@@ -77,6 +232,7 @@ class StockDataService:
                 interval="1d",
                 auto_adjust=bool(auto_adjust),
                 progress=False,
+                session=_YF_SESSION,
             )
         elif start_date is not None:
             yf_end = end_date + timedelta(days=1) if end_date else None
@@ -87,6 +243,7 @@ class StockDataService:
                 interval="1d",
                 auto_adjust=bool(auto_adjust),
                 progress=False,
+                session=_YF_SESSION,
             )
         else:
             # yfinance does not support end-only range directly; fetch max then filter.
@@ -96,18 +253,79 @@ class StockDataService:
                 interval="1d",
                 auto_adjust=bool(auto_adjust),
                 progress=False,
+                session=_YF_SESSION,
             )
 
         if yf_df is None or getattr(yf_df, "empty", True):
             raise ValueError("yfinance returned no data")
 
-        df = cls._normalize_yfinance_df(yf_df)
-        if start_date:
-            df = df[df["date"] >= start_date]
-        if end_date:
-            df = df[df["date"] <= end_date]
+        df = cls._normalize_yfinance_df(yf_df, start_date, end_date)
         return df.sort_values("date").reset_index(drop=True)
 
+    @classmethod
+    def fetch_yfinance_ohlcv_many(
+        cls,
+        stock_codes: list[str],
+        *,
+        start_date: date,
+        end_date: Optional[date],
+        auto_adjust: bool,
+        chunk_size: int = 20,
+    ) -> dict[str, pd.DataFrame]:
+        """Download several symbols with one yfinance request per chunk.
+
+        Args:
+            stock_codes: Codes to fetch (validated; fetched upper-cased).
+            start_date: Inclusive start date.
+            end_date: Inclusive end date, or `None` for latest.
+            auto_adjust: Passed through to `yf.download`.
+            chunk_size: Symbols per request (Yahoo accepts up to 20).
+        Returns:
+            Normalized, date-sorted frames keyed by upper-cased code. Symbols with no
+            rows (or whose chunk failed to download) are omitted.
+        """
+        import yfinance as yf
+
+        codes = list(dict.fromkeys(cls._validate_code(c).upper() for c in stock_codes))
+        yf_end = end_date + timedelta(days=1) if end_date else None
+        out: dict[str, pd.DataFrame] = {}
+        for i in range(0, len(codes), chunk_size):
+            chunk = codes[i : i + chunk_size]
+            try:
+                raw = yf.download(
+                    " ".join(chunk),
+                    start=start_date,
+                    end=yf_end,
+                    interval="1d",
+                    auto_adjust=bool(auto_adjust),
+                    group_by="ticker",
+                    threads=True,
+                    progress=False,
+                    session=_YF_SESSION,
+                )
+            except Exception:
+                logger.warning("yfinance batch download failed for %s", chunk, exc_info=True)
+                continue
+            if raw is None or getattr(raw, "empty", True):
+                continue
+
+            grouped = isinstance(raw.columns, pd.MultiIndex)
+            tickers = set(raw.columns.get_level_values(0)) if grouped else set()
+            for code in chunk:
+                if code in tickers:
+                    part = raw[code]
+                elif len(chunk) == 1:
+                    part = raw
+                else:
+                    continue
+                part = part.dropna(how="all")
+                if part.empty:
+                    continue
+                df = cls._normalize_yfinance_df(part, start_date, end_date)
+                if not df.empty:
+                    out[code] = df.sort_values("date").reset_index(drop=True)
+        return out
+
     @staticmethod
     def _candidate_paths(data_dir: Path, code: str) -> list[Path]:
         candidates = [
@@ -128,10 +346,11 @@ class StockDataService:
     def resolve_csv_path(cls, stock_code: str, data_dir: Optional[Path] = None) -> Path:
         code = cls._validate_code(stock_code)
         data_dir = Path(data_dir) if data_dir else Path(settings.DATA_DIR)
-        for candidate in cls._candidate_paths(data_dir, code):
-            if candidate.exists() and candidate.is_file():
-                return candidate
-        raise FileNotFoundError(f"No CSV found for code={code} in {data_dir}")
+        try:
+            dir_mtime_ns = data_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No CSV found for code={code} in {data_dir}") from None
+        return Path(_resolve_csv_path_cached(code, str(data_dir), dir_mtime_ns))
 
     @staticmethod
     def read_price_csv(csv_path: Path) -> pd.DataFrame:
@@ -139,34 +358,99 @@ class StockDataService:
         Reads CSV files in either:
         - simple format: date,open,high,low,close,volume
         - repo format: first column named 'Price' and extra rows (Ticker/Date) that need skipping.
+
+        Parsed frames are cached in-process and in the Django cache (Arrow IPC bytes when
+        pyarrow is installed) under a key that includes the file's mtime/size, so a
+        rewritten CSV is re-parsed automatically.
         """
         csv_path = Path(csv_path)
+        st = csv_path.stat()
+        timeout = getattr(settings, "PRICE_CSV_CACHE_SECONDS", 0)
+        if timeout <= 0:
+            return StockDataService._load_price_frame(csv_path, st)
+
+        resolved = str(csv_path.resolve())
+        memo_key = (resolved, st.st_mtime_ns, st.st_size)
+        with _PRICE_FRAME_MEMO_LOCK:
+            df = _PRICE_FRAME_MEMO.get(memo_key)
+            if df is not None:
+                _PRICE_FRAME_MEMO.move_to_end(memo_key)
+        if df is not None:
+            return df.copy()
+
+        cache_key = f"ohlcv:v2:{resolved}:{st.st_mtime_ns}:{st.st_size}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            df = _frame_from_cache_value(cached)
+        else:
+            df = StockDataService._load_price_frame(csv_path, st)
+            cache.set(cache_key, _frame_to_cache_value(df), timeout=timeout)
+
+        with _PRICE_FRAME_MEMO_LOCK:
+            _PRICE_FRAME_MEMO[memo_key] = df
+            while len(_PRICE_FRAME_MEMO) > _PRICE_FRAME_MEMO_SIZE:
+                _PRICE_FRAME_MEMO.popitem(last=False)
+        return df.copy()
+
+    @staticmethod
+    def _load_price_frame(csv_path: Path, st: os.stat_result) -> pd.DataFrame:
+        """Load a parsed price frame from its Feather sidecar, or parse the CSV and write one.
+
+        Args:
+            csv_path: Source CSV (remains the source of truth).
+            st: `stat()` of `csv_path`; its mtime/size are part of the sidecar name.
+        Returns:
+            The same frame `_parse_price_csv` returns.
+        Notes:
+            Sidecars live in `<csv dir>/cache/` and are only used when pyarrow is installed
+            and `PRICE_FEATHER_CACHE` is enabled; any sidecar I/O error falls back to the CSV.
+        """
+        if pa is None or not getattr(settings, "PRICE_FEATHER_CACHE", False):
+            return StockDataService._parse_price_csv(csv_path)
 
+        sidecar = csv_path.parent / "cache" / f"{csv_path.stem}__{st.st_mtime_ns}_{st.st_size}.v2.feather"
         try:
-            df = pd.read_csv(csv_path)
-        except Exception:
-            df = pd.read_csv(csv_path, skiprows=[1, 2])
+            return pa_feather.read_table(sidecar).to_pandas(split_blocks=True, self_destruct=True)
+        except (OSError, pa.ArrowException):
+            pass
 
-        if not len(df.columns):
-            raise ValueError(f"CSV has no columns: {csv_path}")
+        df = StockDataService._parse_price_csv(csv_path)
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+            compression = "zstd" if pa.Codec.is_available("zstd") else None
+            pa_feather.write_feather(table, tmp_path, compression=compression)
+            os.replace(tmp_path, sidecar)
+            for stale in sidecar.parent.glob(f"{csv_path.stem}__*.feather"):
+                if stale != sidecar:
+                    stale.unlink(missing_ok=True)
+        except (OSError, pa.ArrowException, TypeError, ValueError):
+            logger.debug("could not write feather sidecar for %s", csv_path, exc_info=True)
+        return df
 
-        first_col = df.columns[0]
-        if first_col.lower() in {"price", "date"}:
-            df = df.rename(columns={first_col: "date"})
-        elif "date" not in {c.lower() for c in df.columns}:
-            df = df.rename(columns={first_col: "date"})
+    @staticmethod
+    def _parse_price_csv(csv_path: Path, *, all_columns: bool = False) -> pd.DataFrame:
+        df = StockDataService._parse_price_csv_arrow(csv_path, all_columns=all_columns)
+        if df is not None:
+            return df
 
-        normalized = {c.lower(): c for c in df.columns}
-        required = ["date", "open", "high", "low", "close", "volume"]
-        missing = [k for k in required if k not in normalized]
+        _, meta_rows = _sniff_price_csv(csv_path)
+        header = list(pd.read_csv(csv_path, nrows=0).columns)
+
+        if not header:
+            raise ValueError(f"CSV has no columns: {csv_path}")
+
+        columns, missing = _canonical_price_columns(header)
         if missing:
             raise ValueError(f"CSV missing required columns {missing}: {csv_path}")
+        # Reads only parse the OHLCV columns; extras (Adj Close, dividends, ...) are
+        # skipped unless the caller is about to rewrite the file.
+        keep = [i for i, name in enumerate(columns) if all_columns or name in _PRICE_COLUMNS]
+        df = pd.read_csv(csv_path, skiprows=[1, 2] if meta_rows else None, usecols=keep)
+        df.columns = [columns[i] for i in keep]
 
-        df = df.rename(columns={normalized["date"]: "date"})
-        for col in ["open", "high", "low", "close", "volume"]:
-            df = df.rename(columns={normalized[col]: col})
-
-        df["date"] = pd.to_datetime(df["date"], errors="coerce", format="mixed")
+        df["date"] = _parse_dates(df["date"])
         df = df.dropna(subset=["date"])
         df["date"] = df["date"].dt.date
 
@@ -177,11 +461,85 @@ class StockDataService:
         df = df.sort_values("date").reset_index(drop=True)
         return df
 
+    @staticmethod
+    def _parse_price_csv_arrow(csv_path: Path, *, all_columns: bool = False) -> Optional[pd.DataFrame]:
+        """Parse well-formed price CSVs with pyarrow's multithreaded reader.
+
+        Args:
+            csv_path: CSV in either supported layout (see `read_price_csv`).
+            all_columns: Keep non-OHLCV columns too (needed before rewriting the file).
+        Returns:
+            The same frame the pandas path would produce, or `None` when pyarrow is
+            unavailable or the file needs the pandas path's lenient coercion (non-ISO
+            dates, non-numeric cells, duplicate/missing columns, ...).
+        """
+        if pacsv is None:
+            return None
+        try:
+            names, skip = _sniff_price_csv(csv_path)
+            if not names or len(set(names)) != len(names):
+                return None
+
+            columns, missing = _canonical_price_columns(names)
+            if missing or columns.count("date") != 1 or len(set(columns)) != len(columns):
+                return None
+
+            table = pacsv.read_csv(
+                csv_path,
+                read_options=pacsv.ReadOptions(column_names=columns, skip_rows=1, skip_rows_after_names=skip),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={"date": pa.date32()},
+                    strings_can_be_null=True,
+                    include_columns=[name for name in columns if all_columns or name in _PRICE_COLUMNS],
+                ),
+            )
+        except (pa.ArrowException, OSError, UnicodeDecodeError, csv.Error):
+            return None
+
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        if not all(pd.api.types.is_numeric_dtype(df[col]) for col in ("open", "high", "low", "close", "volume")):
+            return None
+        df = df.dropna(subset=["date"])
+        df = df.dropna(subset=["open", "high", "low", "close"])
+        return df.sort_values("date").reset_index(drop=True)
+
+    @staticmethod
+    def _slice_date_range(df: pd.DataFrame, start_date: Optional[date], end_date: Optional[date]) -> pd.DataFrame:
+        """Slice a date-sorted price frame to `[start_date, end_date]` (inclusive).
+
+        Args:
+            df: Frame sorted by `date` (as produced by `read_price_csv`).
+            start_date: Inclusive lower bound, or `None`.
+            end_date: Inclusive upper bound, or `None`.
+        Returns:
+            The matching rows with a default RangeIndex; bounds are found by binary search
+            instead of building boolean masks.
+        Notes:
+            The index is relabelled in place rather than via `reset_index`, which would
+            copy every column just to renumber the rows. The slice shares buffers with
+            `df`, which callers treat as a throwaway frame from `read_price_csv`.
+        """
+        if not df.empty and (start_date or end_date):
+            dates = df["date"].to_numpy()
+            lo = int(np.searchsorted(dates, start_date, side="left")) if start_date else 0
+            hi = int(np.searchsorted(dates, end_date, side="right")) if end_date else len(dates)
+            if lo or hi != len(df):
+                # Shallow copy: shares the column buffers but is a standalone frame, so
+                # callers may add columns without SettingWithCopyWarning.
+                df = df.iloc[lo:hi].copy(deep=False)
+        index = df.index
+        if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+            df.index = pd.RangeIndex(len(df))
+        return df
+
     @staticmethod
     def _data_range(df: pd.DataFrame) -> tuple[Optional[date], Optional[date]]:
+        # Callers pass date-sorted frames (read_price_csv / _merge_and_write_csv /
+        # _slice_date_range), so the bounds are simply the first and last rows.
         if df.empty:
             return None, None
-        return df["date"].min(), df["date"].max()
+        dates = df["date"]
+        return dates.iloc[0], dates.iloc[-1]
 
     @staticmethod
     def _file_last_modified_iso(csv_path: Path) -> Optional[str]:
@@ -202,6 +560,31 @@ class StockDataService:
         *,
         force_refresh: bool,
     ) -> tuple[bool, str]:
+        wanted, reason = cls._refresh_check(start_date, end_date, min_date, max_date, force_refresh=force_refresh)
+        if not wanted:
+            return False, reason
+
+        cooldown = max(settings.AUTO_REFRESH_COOLDOWN_SECONDS, 0)
+        if cooldown and not force_refresh and not cls._maybe_mark_refreshed(stock_code, cooldown):
+            return False, "cooldown"
+
+        return True, reason
+
+    @staticmethod
+    def _refresh_check(
+        start_date: Optional[date],
+        end_date: Optional[date],
+        min_date: Optional[date],
+        max_date: Optional[date],
+        *,
+        force_refresh: bool,
+    ) -> tuple[bool, str]:
+        """Decide whether the requested range calls for a refresh, ignoring the cooldown.
+
+        Returns:
+            `(wanted, reason)`. Unlike `_should_refresh` this has no side effects, so the
+            API response cache can use it to tell whether a request may be replayed.
+        """
         if not settings.AUTO_REFRESH_ON_REQUEST:
             return False, "disabled"
         if not start_date and not end_date:
@@ -212,25 +595,46 @@ class StockDataService:
         if coverage_start and coverage_end and not force_refresh:
             return False, "covered_by_local"
 
-        reason = "range_not_covered"
         if min_date is None and max_date is None:
-            reason = "no_local_data"
-        elif start_date and min_date and start_date < min_date:
-            reason = "start_date_before_min_date"
-        elif end_date and max_date and end_date > max_date:
-            reason = "end_date_after_max_date"
-
-        cooldown = max(settings.AUTO_REFRESH_COOLDOWN_SECONDS, 0)
-        if cooldown and not force_refresh:
-            key = f"stock_refresh:{stock_code}"
-            last_refresh = cache.get(key)
-            if last_refresh and (datetime.now(timezone.utc) - last_refresh).total_seconds() < cooldown:
-                return False, "cooldown"
+            return True, "no_local_data"
+        if start_date and min_date and start_date < min_date:
+            return True, "start_date_before_min_date"
+        if end_date and max_date and end_date > max_date:
+            return True, "end_date_after_max_date"
+        return True, "range_not_covered"
 
-        return True, reason
+    @staticmethod
+    def _maybe_mark_refreshed(stock_code: str, cooldown: int) -> bool:
+        """Atomically claim the refresh slot for `stock_code`.
+
+        Args:
+            stock_code: Code being refreshed.
+            cooldown: Cooldown window in seconds (the marker's TTL).
+        Returns:
+            True if no refresh happened within the cooldown and this caller now owns it.
+        Notes:
+            `cache.add` is a single `SET NX EX` on django-redis (and lock-protected on
+            locmem), so concurrent requests cannot both trigger a download.
+        """
+        return cache.add(f"stock_refresh:{stock_code}", datetime.now(timezone.utc), timeout=cooldown)
 
     @staticmethod
-    def _normalize_yfinance_df(df: pd.DataFrame) -> pd.DataFrame:
+    def _normalize_yfinance_df(
+        df: pd.DataFrame,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """Convert a yfinance frame to `date,open,high,low,close,volume` rows.
+
+        Args:
+            df: Frame returned by `yf.download` (flat or ticker/field MultiIndex columns).
+            start_date: Optional inclusive lower bound on `date`.
+            end_date: Optional inclusive upper bound on `date`.
+        Returns:
+            Rows with a valid date and OHLC values inside the bounds, with a RangeIndex.
+        Notes:
+            The date bounds join the NaN mask, so the output frame is built exactly once.
+        """
         if isinstance(df.columns, pd.MultiIndex):
             df = df.copy()
             df.columns = [col[0] for col in df.columns]
@@ -259,22 +663,44 @@ class StockDataService:
             elif key == "volume":
                 column_map[col] = "volume"
 
-        df = df.rename(columns=column_map)
+        # reset_index() above returned a fresh frame, so relabel in place instead of rename().
+        df.columns = [column_map.get(c, c) for c in df.columns]
 
         required = {"date", "open", "high", "low", "close", "volume"}
         missing = required - set(df.columns)
         if missing:
             raise ValueError(f"yfinance missing columns: {sorted(missing)}")
 
-        df["date"] = pd.to_datetime(df["date"], errors="coerce", format="mixed")
-        df = df.dropna(subset=["date"])
-        df["date"] = df["date"].dt.date
-
-        for col in ["open", "high", "low", "close", "volume"]:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-        df = df.dropna(subset=["open", "high", "low", "close"])
-        return df[["date", "open", "high", "low", "close", "volume"]]
+        # yfinance already hands back a DatetimeIndex and numeric columns, so the generic
+        # coercions only run when needed and both dropna passes collapse into one mask.
+        dates = df["date"]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = _parse_dates(dates)
+        date_ok = dates.notna().to_numpy()
+        if not date_ok.all():
+            df, dates = df[date_ok], dates[date_ok]
+
+        columns = {}
+        for col in ("open", "high", "low", "close", "volume"):
+            series = df[col]
+            columns[col] = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors="coerce")
+        ohlc = np.column_stack(
+            [columns[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in ("open", "high", "low", "close")]
+        )
+        keep = ~np.isnan(ohlc).any(axis=1)
+        if start_date or end_date:
+            local = dates.dt.tz_localize(None) if dates.dt.tz is not None else dates
+            days = local.to_numpy().astype("datetime64[D]")
+            if start_date:
+                keep &= days >= np.datetime64(start_date, "D")
+            if end_date:
+                keep &= days <= np.datetime64(end_date, "D")
+        if not keep.all():
+            dates = dates[keep]
+            columns = {col: series[keep] for col, series in columns.items()}
+        out = pd.DataFrame({"date": dates.dt.date, **columns})
+        out.index = pd.RangeIndex(len(out))
+        return out
 
     @classmethod
     def _fetch_yfinance(
@@ -293,6 +719,7 @@ class StockDataService:
                 interval="1d",
                 auto_adjust=False,
                 progress=False,
+                session=_YF_SESSION,
             )
         else:
             yf_end = end_date + timedelta(days=1) if end_date else None
@@ -303,29 +730,114 @@ class StockDataService:
                 interval="1d",
                 auto_adjust=False,
                 progress=False,
+                session=_YF_SESSION,
             )
 
         if data is None or data.empty:
             raise ValueError("yfinance returned no data")
 
-        df = cls._normalize_yfinance_df(data)
-        if start_date:
-            df = df[df["date"] >= start_date]
-        if end_date:
-            df = df[df["date"] <= end_date]
-        return df.reset_index(drop=True)
+        return cls._normalize_yfinance_df(data, start_date, end_date)
 
     @classmethod
     def _merge_and_write_csv(cls, csv_path: Path, existing: pd.DataFrame, incoming: pd.DataFrame) -> pd.DataFrame:
+        """Merge freshly fetched rows into a CSV, letting `incoming` win on duplicate dates.
+
+        Args:
+            csv_path: CSV to update.
+            existing: Current contents (date-sorted, as returned by `read_price_csv`).
+            incoming: Newly fetched rows.
+        Returns:
+            The merged, date-sorted frame that is now on disk.
+        Notes:
+            The common refresh case (a sorted tail that re-covers every stored date from its
+            first row and runs past the last one) is merged by slicing at a `searchsorted` cut; when
+            nothing overlaps and the on-disk header lines up, the rows are appended to the
+            file instead of rewriting it. Files with extra columns (e.g. Adj Close) are
+            re-read in full first so a rewrite keeps them; the returned frame still only
+            carries the OHLCV columns, like `read_price_csv`.
+        """
+        names, _ = _sniff_price_csv(csv_path)
+        header, _ = _canonical_price_columns(names)
+        if any(name not in _PRICE_COLUMNS for name in header):
+            existing = cls._parse_price_csv(csv_path, all_columns=True)
+        combined = cls._merge_rows(csv_path, header, existing, incoming)
+        if len(combined.columns) != len(_PRICE_COLUMNS):
+            combined = combined[[name for name in combined.columns if name in _PRICE_COLUMNS]]
+        return combined
+
+    @classmethod
+    def _merge_rows(
+        cls, csv_path: Path, header: list[str], existing: pd.DataFrame, incoming: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Write `existing` merged with `incoming` to `csv_path` and return the merged frame."""
+        tail = cls._merge_tail(existing, incoming, header)
+        if tail is not None:
+            cut, can_append = tail
+            combined = pd.concat([existing.iloc[:cut], incoming], ignore_index=True)
+            if can_append and cls._ends_with_newline(csv_path):
+                with open(csv_path, "a", newline="") as fh:
+                    incoming.to_csv(fh, header=False, index=False)
+                return combined
+            temp_path = csv_path.with_suffix(".tmp")
+            combined.to_csv(temp_path, index=False)
+            temp_path.replace(csv_path)
+            return combined
+
         combined = pd.concat([existing, incoming], ignore_index=True)
-        combined = combined.drop_duplicates(subset=["date"], keep="last")
-        combined = combined.sort_values("date").reset_index(drop=True)
+        # A stable sort keeps equal dates in concat order, so the last row of each run is
+        # the `incoming` one; comparing neighbours replaces hashing every date object.
+        days = combined["date"].to_numpy().astype("datetime64[D]")
+        order = np.argsort(days, kind="stable")
+        days = days[order]
+        last_of_run = np.append(days[1:] != days[:-1], True)
+        combined = combined.take(order[last_of_run]).reset_index(drop=True)
 
         temp_path = csv_path.with_suffix(".tmp")
         combined.to_csv(temp_path, index=False)
         temp_path.replace(csv_path)
         return combined
 
+    @staticmethod
+    def _merge_tail(
+        existing: pd.DataFrame, incoming: pd.DataFrame, header: list[str]
+    ) -> Optional[tuple[int, bool]]:
+        """Return `(cut, can_append)` when `incoming` is a clean tail of `existing`, else `None`.
+
+        A clean tail re-covers every stored date from the cut onwards, so slicing at the
+        cut drops nothing that `incoming` does not replace; a gap in the overlap falls back
+        to the full merge. `header` is the file's canonicalized on-disk header; appending
+        is only allowed when `incoming` has exactly those columns in that order.
+        """
+        if existing.empty or incoming.empty:
+            return None
+        new_dates = incoming["date"]
+        if not (new_dates.is_monotonic_increasing and new_dates.is_unique):
+            return None
+        if not existing["date"].is_unique:
+            return None
+        old_dates = existing["date"].to_numpy()
+        if new_dates.iloc[-1] < old_dates[-1]:
+            return None
+        cut = int(np.searchsorted(old_dates, new_dates.iloc[0], side="left"))
+        if cut < len(old_dates):
+            replaced = old_dates[cut:]
+            new_values = new_dates.to_numpy()
+            pos = np.searchsorted(new_values, replaced, side="left")
+            # In range: `incoming` ends at or after the last stored date (checked above).
+            if not (new_values[pos] == replaced).all():
+                return None
+        can_append = cut == len(old_dates) and header == list(incoming.columns)
+        return cut, can_append
+
+    @staticmethod
+    def _ends_with_newline(path: Path) -> bool:
+        try:
+            with open(path, "rb") as fh:
+                fh.seek(-1, 2)
+                return fh.read(1) == b"\n"
+        except OSError:
+            return False
+
     @classmethod
     def _get_stock_data_with_meta(
         cls,
@@ -398,8 +910,9 @@ class StockDataService:
                 meta["refresh"]["status"] = "failed"
                 meta["refresh"]["reason"] = str(exc)
             finally:
+                # Non-forced refreshes already claimed the cooldown marker in _should_refresh.
                 cooldown = max(settings.AUTO_REFRESH_COOLDOWN_SECONDS, 0)
-                if cooldown:
+                if cooldown and force_refresh:
                     cache.set(f"stock_refresh:{stock_code}", datetime.now(timezone.utc), timeout=cooldown)
         else:
             meta["refresh"]["reason"] = reason
@@ -428,12 +941,7 @@ class StockDataService:
             force_refresh=force_refresh,
         )
 
-        if start_date:
-            df = df[df["date"] >= start_date]
-        if end_date:
-            df = df[df["date"] <= end_date]
-
-        df = df.reset_index(drop=True)
+        df = cls._slice_date_range(df, start_date, end_date)
 
         if meta is not None:
             filtered_min, filtered_max = cls._data_range(df)
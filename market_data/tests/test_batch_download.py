@@ -72,6 +72,27 @@ def test_normalize_yfinance_df_multiindex_columns():
     assert out.iloc[0]["date"] == date(2025, 1, 1)
 
 
+@pytest.mark.django_db
+def test_normalize_yfinance_df_clips_to_date_bounds():
+    idx = pd.date_range("2025-01-01", periods=5, freq="D", tz="America/New_York")
+    raw = pd.DataFrame(
+        {
+            "Open": [1.0, 2.0, float("nan"), 4.0, 5.0],
+            "High": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "Low": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "Close": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "Volume": [10, 20, 30, 40, 50],
+        },
+        index=idx,
+    )
+    raw.index.name = "Date"
+
+    out = StockDataService._normalize_yfinance_df(raw, date(2025, 1, 2), date(2025, 1, 4))
+    assert out["date"].tolist() == [date(2025, 1, 2), date(2025, 1, 4)]
+    assert out["close"].tolist() == [2.0, 4.0]
+    assert isinstance(out.index, pd.RangeIndex)
+
+
 @pytest.mark.django_db
 def test_yfinance_batch_csv_command_writes_and_skips(tmp_path, settings, monkeypatch):
     settings.DATA_DIR = tmp_path
@@ -122,3 +143,29 @@ def test_yfinance_batch_csv_command_writes_and_skips(tmp_path, settings, monkeyp
     second = out_path.read_text()
     assert second == first
 
+
+
+@pytest.mark.django_db
+def test_fetch_yfinance_ohlcv_many_splits_grouped_frame(monkeypatch):
+    calls = []
+
+    def fake_download(tickers, **kwargs):
+        calls.append(tickers)
+        idx = pd.to_datetime(["2025-01-01", "2025-01-02"])
+        cols = pd.MultiIndex.from_product([tickers.split(), ["Open", "High", "Low", "Close", "Volume"]])
+        raw = pd.DataFrame([[1.0, 2.0, 0.5, 1.5, 100] * len(tickers.split())] * 2, index=idx, columns=cols)
+        raw.index.name = "Date"
+        # Second symbol has no data on the first day (yfinance pads with NaN).
+        raw.loc[idx[0], tickers.split()[-1]] = float("nan")
+        return raw
+
+    monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(download=fake_download))
+
+    out = StockDataService.fetch_yfinance_ohlcv_many(
+        ["aapl", "MSFT", "AAPL", "TSLA"], start_date=date(2025, 1, 1), end_date=None, auto_adjust=True, chunk_size=2
+    )
+    assert calls == ["AAPL MSFT", "TSLA"]
+    assert set(out) == {"AAPL", "MSFT", "TSLA"}
+    assert len(out["AAPL"]) == 2
+    assert out["MSFT"]["date"].tolist() == [date(2025, 1, 2)]
+    assert list(out["AAPL"].columns) == ["date", "open", "high", "low", "close", "volume"]
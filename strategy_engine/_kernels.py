@@ -0,0 +1,316 @@
+"""Numeric kernels for the strategy engine.
+
+Kernels operate on contiguous float64 arrays and are JIT-compiled with Numba when
+it is installed; otherwise they run as plain Python with identical semantics.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised only without numba installed
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+SIGNAL_BUY = 0
+SIGNAL_SELL = 1
+
+FILL_REBALANCE = 0
+FILL_STOP = 1
+
+
+@njit(cache=True, nogil=True)
+def _crossovers(short_ma, long_ma, confirm_bars, min_cross_gap):
+    """Scan MA crossovers with confirmation and same-type gap suppression.
+
+    Args:
+        short_ma: Short moving average (no NaNs).
+        long_ma: Long moving average (no NaNs), same length as `short_ma`.
+        confirm_bars: Extra bars the new side must hold; the signal is emitted on the
+            last confirming bar.
+        min_cross_gap: Minimum bar distance between two signals of the same type.
+    Returns:
+        `(indices, kinds)`: int64 bar indices of emitted signals and int8 kinds
+        (`SIGNAL_BUY`/`SIGNAL_SELL`), in cross order.
+    """
+    n = short_ma.shape[0]
+    diff = short_ma - long_ma
+    indices = np.empty(n, dtype=np.int64)
+    kinds = np.empty(n, dtype=np.int8)
+    count = 0
+    has_buy = False
+    has_sell = False
+    last_buy = 0
+    last_sell = 0
+
+    for i in range(1, n):
+        if diff[i] > 0 and diff[i - 1] <= 0:
+            kind = SIGNAL_BUY
+        elif diff[i] < 0 and diff[i - 1] >= 0:
+            kind = SIGNAL_SELL
+        else:
+            continue
+
+        confirmed = i
+        if confirm_bars > 0:
+            end = i + confirm_bars
+            if end >= n:
+                continue
+            held = True
+            for j in range(i, end + 1):
+                if (kind == SIGNAL_BUY and not diff[j] > 0) or (kind == SIGNAL_SELL and not diff[j] < 0):
+                    held = False
+                    break
+            if not held:
+                continue
+            confirmed = end
+
+        if kind == SIGNAL_BUY:
+            if has_buy and confirmed - last_buy <= min_cross_gap:
+                continue
+            has_buy = True
+            last_buy = confirmed
+        else:
+            if has_sell and confirmed - last_sell <= min_cross_gap:
+                continue
+            has_sell = True
+            last_sell = confirmed
+
+        indices[count] = confirmed
+        kinds[count] = kind
+        count += 1
+
+    return indices[:count], kinds[:count]
+
+
+@njit(cache=True, nogil=True)
+def _ewm_mean(values, alpha, min_periods):
+    """Exponentially weighted mean matching `Series.ewm(alpha=..., adjust=False).mean()`.
+
+    Args:
+        values: float64 input; NaNs are skipped but still decay the previous weight
+            (pandas' `ignore_na=False`).
+        alpha: Smoothing factor in (0, 1].
+        min_periods: Observations required before a value is emitted.
+    Returns:
+        float64 array of the same length, NaN until `min_periods` observations.
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    old_wt_factor = 1.0 - alpha
+    weighted = values[0]
+    nobs = 0 if np.isnan(weighted) else 1
+    out[0] = weighted if nobs >= min_periods else np.nan
+    old_wt = 1.0
+
+    for i in range(1, n):
+        cur = values[i]
+        is_observation = not np.isnan(cur)
+        if is_observation:
+            nobs += 1
+        if not np.isnan(weighted):
+            old_wt *= old_wt_factor
+            if is_observation:
+                # pandas' update order; skipping equal values keeps constant series exact.
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        out[i] = weighted if nobs >= min_periods else np.nan
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _simulate_rebalance(
+    opens,
+    closes,
+    highs,
+    lows,
+    targets,
+    prev_atr,
+    initial_capital,
+    fee_rate,
+    slippage_rate,
+    allow_fractional,
+    use_chandelier_stop,
+    chandelier_k,
+    use_vol_stop,
+    vol_stop_atr_mult,
+):
+    """Bar-by-bar rebalance-at-open simulation with optional ATR stops.
+
+    Args:
+        opens: Open prices (no NaNs).
+        closes: Close prices (no NaNs).
+        highs: High prices; NaN is allowed and propagates like the Python loop did.
+        lows: Low prices; a NaN low never triggers a stop.
+        targets: Target exposure per bar (already shifted, clipped at 0).
+        prev_atr: Previous bar's ATR per bar, NaN when unavailable.
+        initial_capital: Starting cash.
+        fee_rate: Proportional fee per fill.
+        slippage_rate: Proportional slippage applied to the fill price.
+        allow_fractional: When False, rebalance quantities are truncated to whole shares.
+        use_chandelier_stop: Enable the `high_max - k * ATR` stop.
+        chandelier_k: Chandelier ATR multiple.
+        use_vol_stop: Enable the `entry - k * ATR` stop.
+        vol_stop_atr_mult: Vol-stop ATR multiple.
+    Returns:
+        `(equity, cash, shares, fills)` where the first three are per-bar close-of-day
+        float64 arrays and `fills` is `(rows, sides, quantities, open_prices,
+        fill_prices, reasons, flat_flags)` in execution order. `sides` uses
+        `SIGNAL_BUY`/`SIGNAL_SELL`, `reasons` uses `FILL_REBALANCE`/`FILL_STOP`, and
+        `flat_flags` marks buys from a flat book and sells that leave it flat.
+    """
+    n = opens.shape[0]
+    equity = np.empty(n, dtype=np.float64)
+    cash_out = np.empty(n, dtype=np.float64)
+    shares_out = np.empty(n, dtype=np.float64)
+    fill_rows = np.empty(2 * n, dtype=np.int64)
+    fill_sides = np.empty(2 * n, dtype=np.int8)
+    fill_quantities = np.empty(2 * n, dtype=np.float64)
+    fill_opens = np.empty(2 * n, dtype=np.float64)
+    fill_prices = np.empty(2 * n, dtype=np.float64)
+    fill_reasons = np.empty(2 * n, dtype=np.int8)
+    fill_flat = np.empty(2 * n, dtype=np.bool_)
+    count = 0
+
+    cash = initial_capital
+    shares = 0.0
+    has_entry = False
+    entry_price = 0.0
+    has_high = False
+    high_max = 0.0
+
+    for k in range(n):
+        open_price = opens[k]
+        high_price = highs[k]
+        target = targets[k]
+
+        had_position_before_open = shares > 0
+        has_stop = False
+        stop_level = 0.0
+        if had_position_before_open and (use_chandelier_stop or use_vol_stop):
+            atr = prev_atr[k]
+            if atr == atr and atr > 0:
+                if use_chandelier_stop and has_high:
+                    stop_level = high_max - chandelier_k * atr
+                    has_stop = True
+                if use_vol_stop and has_entry:
+                    level = entry_price - vol_stop_atr_mult * atr
+                    if not has_stop or level > stop_level:
+                        stop_level = level
+                    has_stop = True
+
+        if open_price > 0:
+            equity_at_open = cash + shares * open_price
+            delta_value = equity_at_open * target - shares * open_price
+
+            if delta_value > 0 and cash > 0:
+                effective_price = open_price * (1 + slippage_rate)
+                unit_cost = effective_price * (1 + fee_rate)
+                if unit_cost > 0:
+                    buy_shares = delta_value / unit_cost
+                    if not allow_fractional:
+                        buy_shares = np.trunc(buy_shares)
+                    max_affordable = cash / unit_cost
+                    if max_affordable < buy_shares:
+                        buy_shares = max_affordable
+                    if buy_shares > 0:
+                        fill_flat[count] = shares <= 0
+                        cash -= buy_shares * unit_cost
+                        shares += buy_shares
+                        fill_rows[count] = k
+                        fill_sides[count] = SIGNAL_BUY
+                        fill_quantities[count] = buy_shares
+                        fill_opens[count] = open_price
+                        fill_prices[count] = effective_price
+                        fill_reasons[count] = FILL_REBALANCE
+                        count += 1
+                        if not has_entry and shares > 0:
+                            has_entry = True
+                            entry_price = effective_price
+                            has_high = True
+                            high_max = high_price
+
+            elif delta_value < 0 and shares > 0:
+                effective_price = open_price * (1 - slippage_rate)
+                unit_revenue = effective_price * (1 - fee_rate)
+                sell_shares = (-delta_value) / open_price
+                if not allow_fractional:
+                    sell_shares = np.trunc(sell_shares)
+                if shares < sell_shares:
+                    sell_shares = shares
+                if sell_shares > 0:
+                    cash += sell_shares * unit_revenue
+                    shares -= sell_shares
+                    fill_rows[count] = k
+                    fill_sides[count] = SIGNAL_SELL
+                    fill_quantities[count] = sell_shares
+                    fill_opens[count] = open_price
+                    fill_prices[count] = effective_price
+                    fill_reasons[count] = FILL_REBALANCE
+                    fill_flat[count] = shares <= 0
+                    count += 1
+                    if shares <= 0:
+                        shares = 0.0
+                        has_entry = False
+                        has_high = False
+
+        if had_position_before_open and has_stop and lows[k] <= stop_level and shares > 0:
+            fill_price = stop_level
+            if open_price > 0 and not stop_level < open_price:
+                fill_price = open_price
+            effective_price = fill_price * (1 - slippage_rate)
+            cash += shares * (effective_price * (1 - fee_rate))
+            fill_rows[count] = k
+            fill_sides[count] = SIGNAL_SELL
+            fill_quantities[count] = shares
+            fill_opens[count] = open_price if open_price > 0 else fill_price
+            fill_prices[count] = effective_price
+            fill_reasons[count] = FILL_STOP
+            fill_flat[count] = True
+            count += 1
+            shares = 0.0
+            has_entry = False
+            has_high = False
+
+        if shares > 0:
+            # Mirrors `max(high_max or high, high)`, including how NaN highs propagate.
+            base = high_max if has_high and high_max != 0.0 else high_price
+            high_max = high_price if high_price > base else base
+            has_high = True
+
+        equity[k] = cash + shares * closes[k]
+        cash_out[k] = cash
+        shares_out[k] = shares
+
+    fills = (
+        fill_rows[:count],
+        fill_sides[:count],
+        fill_quantities[:count],
+        fill_opens[:count],
+        fill_prices[:count],
+        fill_reasons[:count],
+        fill_flat[:count],
+    )
+    return equity, cash_out, shares_out, fills
+
+
+def warmup() -> None:
+    """Compile (or load from the on-disk cache) every kernel with tiny inputs.
+
+    Called from `StrategyEngineConfig.ready()` so the JIT cost is paid at process
+    start instead of on the first request.
+    """
+    _crossovers(np.zeros(2), np.zeros(2), 0, 0)
+    _ewm_mean(np.zeros(2), 0.5, 1)
+    ones = np.ones(2)
+    _simulate_rebalance(ones, ones, ones, ones, ones, ones, 1.0, 0.0, 0.0, True, True, 3.0, True, 2.0)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class StrategyEngineConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "strategy_engine"
+
+    def ready(self):
+        if getattr(settings, "NUMBA_WARMUP", False):
+            from ._kernels import warmup
+
+            warmup()
@@ -11,6 +11,7 @@ import math
 from datetime import date
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -30,15 +31,15 @@ def slice_daily_records(daily: list[dict], *, start: date, end: Optional[date])
     """
     if not daily:
         return pd.DataFrame()
-    df = pd.DataFrame(daily).copy()
+    df = pd.DataFrame(daily)
     if "date" not in df.columns:
         return pd.DataFrame()
     df["date"] = pd.to_datetime(df["date"], errors="coerce", format="mixed").dt.date
-    df = df.dropna(subset=["date"]).sort_values("date").reset_index(drop=True)
-    df = df[df["date"] >= start]
-    if end is not None:
-        df = df[df["date"] <= end]
-    return df.reset_index(drop=True)
+    df = df.dropna(subset=["date"]).sort_values("date")
+    dates = df["date"].to_numpy()
+    lo = int(np.searchsorted(dates, start, side="left"))
+    hi = int(np.searchsorted(dates, end, side="right")) if end is not None else len(dates)
+    return df.iloc[lo:hi].reset_index(drop=True)
 
 
 def compute_max_drawdown(values: pd.Series) -> float:
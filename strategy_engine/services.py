@@ -1,8 +1,11 @@
 import math
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+from ._kernels import FILL_STOP, SIGNAL_BUY, SIGNAL_SELL, _crossovers, _ewm_mean, _simulate_rebalance
+
 
 class StrategyService:
     @staticmethod
@@ -47,18 +50,57 @@ class StrategyService:
             "trading_days_per_year": int(trading_days_per_year),
         }
 
+    @staticmethod
+    def _ewm(series: pd.Series, *, alpha: float, window: int) -> pd.Series:
+        """`series.ewm(alpha=alpha, adjust=False, min_periods=window).mean()` via the compiled kernel.
+
+        Results agree with pandas up to floating-point rounding.
+        """
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.Series(_ewm_mean(values, alpha, window), index=series.index, name=series.name)
+
     @staticmethod
     def _ema(series: pd.Series, *, window: int) -> pd.Series:
         if window < 1:
             raise ValueError("window must be >= 1")
-        return series.ewm(span=window, adjust=False, min_periods=window).mean()
+        return StrategyService._ewm(series, alpha=2.0 / (window + 1.0), window=window)
 
     @staticmethod
     def _rma(series: pd.Series, *, window: int) -> pd.Series:
         if window < 1:
             raise ValueError("window must be >= 1")
         alpha = 1.0 / float(window)
-        return series.ewm(alpha=alpha, adjust=False, min_periods=window).mean()
+        return StrategyService._ewm(series, alpha=alpha, window=window)
+
+    @staticmethod
+    def calculate_macd(
+        df: pd.DataFrame,
+        *,
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9,
+    ) -> tuple[pd.Series, pd.Series]:
+        """Compute MACD lines from `close`.
+
+        Args:
+            df: Frame with a `close` column.
+            fast: Fast EMA span.
+            slow: Slow EMA span (must exceed `fast`).
+            signal: EMA span of the signal line.
+        Returns:
+            `(dif, dea)`: the fast-minus-slow EMA spread and its EMA, aligned with `df`.
+        """
+        if df.empty:
+            return pd.Series(dtype=float), pd.Series(dtype=float)
+        if "close" not in df.columns:
+            raise ValueError("missing close column")
+        if fast >= slow:
+            raise ValueError("fast must be < slow")
+
+        close = pd.to_numeric(df["close"], errors="coerce")
+        dif = StrategyService._ema(close, window=fast) - StrategyService._ema(close, window=slow)
+        dea = StrategyService._ema(dif, window=signal)
+        return dif, dea
 
     @staticmethod
     def calculate_atr(df: pd.DataFrame, *, window: int = 14) -> pd.Series:
@@ -70,24 +112,19 @@ class StrategyService:
         if window < 1:
             raise ValueError("window must be >= 1")
 
-        high = pd.to_numeric(df["high"], errors="coerce")
-        low = pd.to_numeric(df["low"], errors="coerce")
-        close = pd.to_numeric(df["close"], errors="coerce")
-        prev_close = close.shift(1)
-
-        tr = pd.concat(
-            [
-                (high - low).abs(),
-                (high - prev_close).abs(),
-                (low - prev_close).abs(),
-            ],
-            axis=1,
-        ).max(axis=1)
+        high = pd.to_numeric(df["high"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        low = pd.to_numeric(df["low"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        close = pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        prev_close = np.empty_like(close)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
 
-        return StrategyService._rma(tr, window=window)
+        # fmax skips NaN like DataFrame.max(axis=1), so the first bar's TR is high - low.
+        tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
+        return StrategyService._rma(pd.Series(tr, index=df.index), window=window)
 
     @staticmethod
-    def calculate_adx(df: pd.DataFrame, *, window: int = 14) -> pd.Series:
+    def calculate_adx(df: pd.DataFrame, *, window: int = 14, atr: Optional[pd.Series] = None) -> pd.Series:
         if df.empty:
             return pd.Series(dtype=float)
         for col in ["high", "low", "close"]:
@@ -105,7 +142,8 @@ class StrategyService:
         plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0)
         minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0)
 
-        atr = StrategyService.calculate_atr(df, window=window)
+        if atr is None:
+            atr = StrategyService.calculate_atr(df, window=window)
         plus_dm_sm = StrategyService._rma(plus_dm, window=window)
         minus_dm_sm = StrategyService._rma(minus_dm, window=window)
 
@@ -142,16 +180,17 @@ class StrategyService:
 
         close = pd.to_numeric(df["close"], errors="coerce")
 
-        pair_signals: list[pd.Series] = []
+        # Pairs often share windows (e.g. 20 in 5:20 and 20:100), so each MA is computed once.
+        mas = {
+            window: StrategyService._calculate_ma(close, window=window, ma_type=ensemble_ma_type).to_numpy()
+            for window in {w for pair in ensemble_pairs for w in pair}
+        }
+        # A NaN MA compares False, so every pair votes 0/1 on every bar and the trend
+        # score is simply the fraction of pairs whose short MA is above the long MA.
+        votes = np.zeros(len(close), dtype=np.float64)
         for short_w, long_w in ensemble_pairs:
-            ma_s = StrategyService._calculate_ma(close, window=short_w, ma_type=ensemble_ma_type)
-            ma_l = StrategyService._calculate_ma(close, window=long_w, ma_type=ensemble_ma_type)
-            pair_signals.append((ma_s > ma_l).astype(float))
-
-        signal_df = pd.concat(pair_signals, axis=1)
-        valid_counts = signal_df.notna().sum(axis=1).astype(float)
-        trend_score = signal_df.sum(axis=1) / valid_counts.where(valid_counts > 0)
-        return trend_score.clip(lower=0.0, upper=1.0).fillna(0.0)
+            votes += mas[short_w] > mas[long_w]
+        return pd.Series(votes / len(ensemble_pairs), index=close.index)
 
     @staticmethod
     def _dma_exposure_close_from_signals(
@@ -165,26 +204,43 @@ class StrategyService:
         if "ma_short" not in df.columns or "ma_long" not in df.columns:
             raise ValueError("missing ma_short/ma_long columns; call calculate_moving_averages first")
 
-        work = df.copy().reset_index(drop=True)
-
-        def to_iso(value) -> str:
-            return value.isoformat() if hasattr(value, "isoformat") else str(value)
-
-        index_by_date = {to_iso(row["date"]): idx for idx, row in work.iterrows()}
-        signals = StrategyService.generate_signals(
-            work,
+        positions, kinds = StrategyService._crossover_positions(
+            df,
             confirm_bars=confirm_bars,
             min_cross_gap=min_cross_gap,
         )
+        state = np.full(len(df), np.nan)
+        state[positions] = np.where(kinds == SIGNAL_BUY, 1.0, 0.0)
+        return pd.Series(state).ffill().fillna(0.0)
 
-        state = pd.Series([float("nan")] * len(work))
-        for signal in signals:
-            idx = index_by_date.get(signal["date"])
-            if idx is None:
-                continue
-            state.iloc[idx] = 1.0 if signal["signal_type"] == "BUY" else 0.0
-
-        return state.ffill().fillna(0.0)
+    @staticmethod
+    def _crossover_positions(
+        df: pd.DataFrame,
+        *,
+        confirm_bars: int,
+        min_cross_gap: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Run the crossover kernel over the rows where both MAs are defined.
+
+        Args:
+            df: Frame with `ma_short`/`ma_long` columns.
+            confirm_bars: See `generate_signals`.
+            min_cross_gap: See `generate_signals`.
+        Returns:
+            `(positions, kinds)`: positional row indices into `df` and the matching
+            `SIGNAL_BUY`/`SIGNAL_SELL` codes.
+        """
+        short_ma = df["ma_short"].to_numpy(dtype=np.float64, na_value=np.nan)
+        long_ma = df["ma_long"].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~(np.isnan(short_ma) | np.isnan(long_ma))
+        if valid.all():
+            return _crossovers(short_ma, long_ma, confirm_bars, min_cross_gap)
+
+        rows = np.flatnonzero(valid)
+        if rows.size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)
+        indices, kinds = _crossovers(short_ma[rows], long_ma[rows], confirm_bars, min_cross_gap)
+        return rows[indices], kinds
 
     @staticmethod
     def calculate_moving_averages(df: pd.DataFrame, short_window: int = 5, long_window: int = 20) -> pd.DataFrame:
@@ -195,7 +251,8 @@ class StrategyService:
         if "close" not in df.columns:
             raise ValueError("missing close column")
 
-        df = df.copy()
+        # A shallow copy is enough: only new columns are added, the input's data is untouched.
+        df = df.copy(deep=False)
         df["ma_short"] = df["close"].rolling(window=short_window, min_periods=short_window).mean()
         df["ma_long"] = df["close"].rolling(window=long_window, min_periods=long_window).mean()
         return df
@@ -206,9 +263,22 @@ class StrategyService:
         *,
         confirm_bars: int = 0,
         min_cross_gap: int = 0,
-    ) -> list[dict]:
+        with_types: bool = False,
+    ) -> list[dict] | tuple[list[dict], np.ndarray]:
+        """Generate MA crossover signals.
+
+        Args:
+            df: Price frame with `ma_short`/`ma_long` columns.
+            confirm_bars: Bars the cross must hold before the signal is emitted.
+            min_cross_gap: Minimum bars between two signals of the same type.
+            with_types: If True, also return an int8 array parallel to the signals
+                (`SIGNAL_BUY`/`SIGNAL_SELL`) so callers can filter without string compares.
+        Returns:
+            The signal list, or `(signals, types)` when `with_types` is True.
+        """
+        empty_types = np.empty(0, dtype=np.int8)
         if df.empty:
-            return []
+            return ([], empty_types) if with_types else []
         if "ma_short" not in df.columns or "ma_long" not in df.columns:
             raise ValueError("missing ma_short/ma_long columns; call calculate_moving_averages first")
         if confirm_bars < 0:
@@ -216,73 +286,51 @@ class StrategyService:
         if min_cross_gap < 0:
             raise ValueError("min_cross_gap must be >= 0")
 
-        work = df.copy()
-        work = work.dropna(subset=["ma_short", "ma_long"]).reset_index(drop=True)
-        if work.empty:
-            return []
-
-        diff = work["ma_short"] - work["ma_long"]
-        prev_diff = diff.shift(1)
-
-        buy_cross = (diff > 0) & (prev_diff <= 0)
-        sell_cross = (diff < 0) & (prev_diff >= 0)
-
-        def confirm_at(index: int, direction: str) -> Optional[int]:
-            if confirm_bars == 0:
-                return index
-
-            end = index + confirm_bars
-            if end >= len(work):
-                return None
-
-            segment = diff.iloc[index : end + 1]
-            if direction == "BUY":
-                return end if bool((segment > 0).all()) else None
-            return end if bool((segment < 0).all()) else None
-
-        out: list[dict] = []
-        last_idx_by_type: dict[str, int] = {}
-
-        for i in range(len(work)):
-            if bool(buy_cross.iloc[i]):
-                confirmed = confirm_at(i, "BUY")
-                if confirmed is None:
-                    continue
-                if "BUY" in last_idx_by_type and confirmed - last_idx_by_type["BUY"] <= min_cross_gap:
-                    continue
-                last_idx_by_type["BUY"] = confirmed
-                row = work.iloc[confirmed]
-                out.append(
-                    {
-                        "date": row["date"].isoformat(),
-                        "signal_type": "BUY",
-                        "price": float(row["close"]),
-                        "ma_short": float(row["ma_short"]),
-                        "ma_long": float(row["ma_long"]),
-                    }
-                )
-                continue
-
-            if bool(sell_cross.iloc[i]):
-                confirmed = confirm_at(i, "SELL")
-                if confirmed is None:
-                    continue
-                if "SELL" in last_idx_by_type and confirmed - last_idx_by_type["SELL"] <= min_cross_gap:
-                    continue
-                last_idx_by_type["SELL"] = confirmed
-                row = work.iloc[confirmed]
-                out.append(
-                    {
-                        "date": row["date"].isoformat(),
-                        "signal_type": "SELL",
-                        "price": float(row["close"]),
-                        "ma_short": float(row["ma_short"]),
-                        "ma_long": float(row["ma_long"]),
-                    }
-                )
+        positions, kinds = StrategyService._crossover_positions(
+            df,
+            confirm_bars=confirm_bars,
+            min_cross_gap=min_cross_gap,
+        )
+        if positions.size == 0:
+            return ([], empty_types) if with_types else []
+
+        # Gather the signal rows column-wise instead of one `iloc` lookup per signal.
+        dates = df["date"].iloc[positions].tolist()
+        closes = df["close"].to_numpy(dtype=np.float64)[positions].tolist()
+        shorts = df["ma_short"].to_numpy(dtype=np.float64)[positions].tolist()
+        longs = df["ma_long"].to_numpy(dtype=np.float64)[positions].tolist()
+        out = [
+            {
+                "date": d.isoformat(),
+                "signal_type": "BUY" if kind == SIGNAL_BUY else "SELL",
+                "price": close,
+                "ma_short": short,
+                "ma_long": long,
+            }
+            for d, kind, close, short, long in zip(dates, kinds.tolist(), closes, shorts, longs)
+        ]
 
+        if with_types:
+            return out, kinds
         return out
 
+    @staticmethod
+    def _naive_datetime_strings(dates: pd.Series) -> Optional[list[str]]:
+        """Format a tz-naive datetime64 column the way `Timestamp.isoformat()` would.
+
+        Returns:
+            ISO strings from one vectorized `np.datetime_as_string` call, or `None` when
+            the column is not naive datetime64 or has sub-second values (whose
+            `isoformat()` output is not fixed-width).
+        """
+        if not (isinstance(dates.dtype, np.dtype) and dates.dtype.kind == "M"):
+            return None
+        values = dates.to_numpy()
+        seconds = values.astype("datetime64[s]")
+        if not (seconds == values).all():
+            return None
+        return np.datetime_as_string(seconds, unit="s").tolist()
+
     @staticmethod
     def calculate_performance(
         df: pd.DataFrame,
@@ -325,6 +373,10 @@ class StrategyService:
             raise ValueError("fee_rate and slippage_rate must be >= 0")
         if use_adx_filter and not use_regime_filter:
             raise ValueError("use_adx_filter requires use_regime_filter=true")
+        if use_adx_filter:
+            for col in ["high", "low"]:
+                if col not in df.columns:
+                    raise ValueError(f"missing {col} column")
         if trading_days_per_year <= 0:
             raise ValueError("trading_days_per_year must be > 0")
         if max_leverage < 0:
@@ -332,7 +384,7 @@ class StrategyService:
         if min_vol_floor <= 0:
             raise ValueError("min_vol_floor must be > 0")
 
-        work = df.copy().reset_index(drop=True)
+        work = df.reset_index(drop=True)
         work = work.dropna(subset=["date", "open", "close"])
         if work.empty:
             return {"strategy": [], "benchmark": []}
@@ -344,12 +396,17 @@ class StrategyService:
         shares = 0.0
         first_close = float(work.loc[0, "close"])
 
-        strategy_series: list[dict] = []
-        benchmark_series: list[dict] = []
+        # Pull the per-bar inputs out once; the simulation loops below walk plain lists
+        # instead of materializing a Series per row with iterrows().
+        labels = work.index.tolist()
+        date_strs = StrategyService._naive_datetime_strings(work["date"])
+        if date_strs is None:
+            date_strs = [to_iso(value) for value in work["date"].tolist()]
+        opens = work["open"].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
+        closes = work["close"].to_numpy(dtype=np.float64, na_value=np.nan).tolist()
 
         fills: list[dict] = []
         closed_trades: list[dict] = []
-        daily_details: list[dict] = []
         trade_open = False
         trade_entry_date: Optional[str] = None
         trade_cash_flow = 0.0
@@ -431,6 +488,43 @@ class StrategyService:
             else:
                 trade_sell_proceeds += cash_delta
 
+        def build_series(
+            cash_arr: np.ndarray, shares_arr: np.ndarray, targets: np.ndarray
+        ) -> tuple[list[dict], list[dict], list[dict]]:
+            """Turn per-bar end-of-day cash/shares into the strategy/benchmark/daily payloads."""
+            close_arr = np.asarray(closes, dtype=np.float64)
+            position_values = shares_arr * close_arr
+            equities = (cash_arr + position_values).tolist()
+            benchmark_values = [(close_price / first_close) if first_close else 0.0 for close_price in closes]
+            strategy = [
+                {"date": date_str, "value": equity / initial_capital} for date_str, equity in zip(date_strs, equities)
+            ]
+            benchmark = [{"date": date_str, "value": value} for date_str, value in zip(date_strs, benchmark_values)]
+            if not return_details:
+                return strategy, benchmark, []
+            daily = [
+                {
+                    "date": date_str,
+                    "equity": equity,
+                    "value": float(equity / initial_capital),
+                    "benchmark_value": float(benchmark_value),
+                    "exposure": 0.0 if equity <= 0 else position_value / equity,
+                    "target_exposure": target,
+                    "cash": cash,
+                    "shares": shares,
+                }
+                for date_str, equity, benchmark_value, position_value, target, cash, shares in zip(
+                    date_strs,
+                    equities,
+                    benchmark_values,
+                    position_values.tolist(),
+                    targets.tolist(),
+                    cash_arr.tolist(),
+                    shares_arr.tolist(),
+                )
+            ]
+            return strategy, benchmark, daily
+
         all_features_disabled = not (
             use_ensemble
             or use_regime_filter
@@ -444,7 +538,7 @@ class StrategyService:
             if "ma_short" not in df.columns or "ma_long" not in df.columns:
                 raise ValueError("missing ma_short/ma_long columns; call calculate_moving_averages first")
 
-            index_by_date = {to_iso(row["date"]): idx for idx, row in work.iterrows()}
+            index_by_date = dict(zip(date_strs, labels))
             signals = StrategyService.generate_signals(
                 work,
                 confirm_bars=confirm_bars,
@@ -463,11 +557,20 @@ class StrategyService:
                     continue
                 actions_by_index[exec_idx] = signal["signal_type"]
 
-            for i, row in work.iterrows():
-                action = actions_by_index.get(i)
-                open_price = float(row["open"])
-                close_price = float(row["close"])
-                date_str = to_iso(row["date"])
+            # Cash/shares only change on signal bars, so walk those and fill the flat
+            # stretches in between with slice assignments.
+            position_by_label = {label: k for k, label in enumerate(labels)}
+            cash_arr = np.empty(len(labels), dtype=np.float64)
+            shares_arr = np.empty(len(labels), dtype=np.float64)
+            start = 0
+            for k, action in sorted(
+                (position_by_label[i], action) for i, action in actions_by_index.items() if i in position_by_label
+            ):
+                cash_arr[start:k] = cash
+                shares_arr[start:k] = shares
+                start = k
+                date_str = date_strs[k]
+                open_price = opens[k]
 
                 if action == "BUY" and shares <= 0 and cash > 0 and open_price > 0:
                     effective_price = open_price * (1 + slippage_rate)
@@ -513,26 +616,12 @@ class StrategyService:
                         reason="signal",
                     )
                     maybe_close_trade(date_str)
+            cash_arr[start:] = cash
+            shares_arr[start:] = shares
 
-                equity = cash + shares * close_price
-                strategy_series.append({"date": date_str, "value": equity / initial_capital})
-                benchmark_series.append(
-                    {"date": date_str, "value": (close_price / first_close) if first_close else 0.0}
-                )
-                if return_details:
-                    exposure = 0.0 if equity <= 0 else (shares * close_price) / equity
-                    daily_details.append(
-                        {
-                            "date": date_str,
-                            "equity": float(equity),
-                            "value": float(equity / initial_capital),
-                            "benchmark_value": float((close_price / first_close) if first_close else 0.0),
-                            "exposure": float(exposure),
-                            "target_exposure": float(1.0 if shares > 0 else 0.0),
-                            "cash": float(cash),
-                            "shares": float(shares),
-                        }
-                    )
+            strategy_series, benchmark_series, daily_details = build_series(
+                cash_arr, shares_arr, np.where(shares_arr > 0, 1.0, 0.0)
+            )
 
             out: dict = {"strategy": strategy_series, "benchmark": benchmark_series}
             if return_details:
@@ -563,11 +652,22 @@ class StrategyService:
             regime_ma = close.rolling(window=regime_ma_window, min_periods=regime_ma_window).mean()
             exposure_close = exposure_close.where(close > regime_ma, 0.0)
 
-        if use_adx_filter:
-            adx = StrategyService.calculate_adx(work, window=adx_window)
+        # One ATR(vol_window) serves vol targeting, the stops and, when the windows
+        # match, the ADX filter.
+        atr: Optional[pd.Series] = None
+        if use_vol_targeting or use_chandelier_stop or use_vol_stop:
+            atr = StrategyService.calculate_atr(work, window=vol_window)
+
+        # ADX only zeroes bars; when the regime/ensemble gates left nothing positive
+        # there is nothing for it to gate.
+        if use_adx_filter and (exposure_close > 0).any():
+            adx = StrategyService.calculate_adx(
+                work,
+                window=adx_window,
+                atr=atr if adx_window == vol_window else None,
+            )
             exposure_close = exposure_close.where(adx > float(adx_threshold), 0.0)
 
-        atr: Optional[pd.Series] = None
         vol_target_info: Optional[dict] = None
         target_vol_daily_effective: Optional[float] = None
         if use_vol_targeting:
@@ -576,7 +676,6 @@ class StrategyService:
                 target_vol_daily=target_vol_daily,
                 trading_days_per_year=trading_days_per_year,
             )
-            atr = StrategyService.calculate_atr(work, window=vol_window)
             atr_pct = (atr / close).abs()
             vol_safe = atr_pct.clip(lower=float(min_vol_floor))
             scale = (float(target_vol_daily_effective) / vol_safe).clip(upper=float(max_leverage))
@@ -584,139 +683,76 @@ class StrategyService:
 
         desired_exposure = exposure_close.shift(1).fillna(0.0)
 
-        if atr is None and (use_chandelier_stop or use_vol_stop):
-            atr = StrategyService.calculate_atr(work, window=vol_window)
-
-        entry_price: Optional[float] = None
-        high_max: Optional[float] = None
-
-        for i, row in work.iterrows():
-            open_price = float(row["open"])
-            close_price = float(row["close"])
-            high_price = float(row.get("high", close_price))
-            low_price = float(row.get("low", close_price))
-            date_str = to_iso(row["date"])
-
-            target = float(desired_exposure.iloc[i]) if i < len(desired_exposure) else 0.0
-            target = max(0.0, target)
-
-            had_position_before_open = shares > 0
-            stop_level: Optional[float] = None
-            if had_position_before_open and (use_chandelier_stop or use_vol_stop) and atr is not None and i - 1 >= 0:
-                prev_atr = float(atr.iloc[i - 1])
-                if prev_atr == prev_atr and prev_atr > 0:
-                    candidates: list[float] = []
-                    if use_chandelier_stop and high_max is not None:
-                        candidates.append(high_max - float(chandelier_k) * prev_atr)
-                    if use_vol_stop and entry_price is not None:
-                        candidates.append(entry_price - float(vol_stop_atr_mult) * prev_atr)
-                    if candidates:
-                        stop_level = max(candidates)
-
-            if open_price > 0:
-                equity_at_open = cash + shares * open_price
-                desired_position_value = equity_at_open * target
-                current_position_value = shares * open_price
-                delta_value = desired_position_value - current_position_value
-
-                if delta_value > 0 and cash > 0:
-                    effective_price = open_price * (1 + slippage_rate)
-                    unit_cost = effective_price * (1 + fee_rate)
-                    if unit_cost > 0:
-                        desired_buy_shares = delta_value / unit_cost
-                        if not allow_fractional:
-                            desired_buy_shares = int(desired_buy_shares)
-                        max_affordable = cash / unit_cost
-                        buy_shares = min(desired_buy_shares, max_affordable)
-                        if buy_shares > 0:
-                            if not trade_open and shares <= 0:
-                                trade_open = True
-                                trade_entry_date = date_str
-                                trade_cash_flow = 0.0
-                                trade_buy_cost = 0.0
-                                trade_sell_proceeds = 0.0
-                                trade_fill_count = 0
-                            cash -= buy_shares * unit_cost
-                            shares += buy_shares
-                            record_fill(
-                                date_str=date_str,
-                                side="BUY",
-                                quantity=float(buy_shares),
-                                open_price=open_price,
-                                fill_price=effective_price,
-                                fee_rate=fee_rate,
-                                reason="rebalance",
-                            )
-                            if entry_price is None and shares > 0:
-                                entry_price = effective_price
-                                high_max = high_price
+        # Positional inputs for the simulation kernel. `work` keeps its pre-dropna labels,
+        # and exposure/ATR are looked up by label as the per-row loop did (an ATR label
+        # past the end now reads as "no ATR" instead of raising IndexError).
+        label_arr = work.index.to_numpy(dtype=np.int64)
+        desired = desired_exposure.to_numpy(dtype=np.float64)
+        targets = np.zeros(len(label_arr), dtype=np.float64)
+        in_range = label_arr < len(desired)
+        targets[in_range] = desired[label_arr[in_range]]
+        targets = np.where(targets > 0.0, targets, 0.0)
+        prev_atr = np.full(len(label_arr), np.nan)
+        if atr is not None:
+            atr_arr = atr.to_numpy(dtype=np.float64)
+            prev_labels = label_arr - 1
+            has_prev = (prev_labels >= 0) & (prev_labels < len(atr_arr))
+            prev_atr[has_prev] = atr_arr[prev_labels[has_prev]]
+
+        open_arr = np.asarray(opens, dtype=np.float64)
+        close_arr = np.asarray(closes, dtype=np.float64)
+        high_arr = work["high"].to_numpy(dtype=np.float64, na_value=np.nan) if "high" in work.columns else close_arr
+        low_arr = work["low"].to_numpy(dtype=np.float64, na_value=np.nan) if "low" in work.columns else close_arr
+        _, cash_arr, shares_arr, fill_arrays = _simulate_rebalance(
+            open_arr,
+            close_arr,
+            np.ascontiguousarray(high_arr),
+            np.ascontiguousarray(low_arr),
+            targets,
+            prev_atr,
+            float(initial_capital),
+            float(fee_rate),
+            float(slippage_rate),
+            bool(allow_fractional),
+            bool(use_chandelier_stop),
+            float(chandelier_k),
+            bool(use_vol_stop),
+            float(vol_stop_atr_mult),
+        )
 
-                elif delta_value < 0 and shares > 0:
-                    effective_price = open_price * (1 - slippage_rate)
-                    unit_revenue = effective_price * (1 - fee_rate)
-                    desired_sell_shares = (-delta_value) / open_price
-                    if not allow_fractional:
-                        desired_sell_shares = int(desired_sell_shares)
-                    sell_shares = min(desired_sell_shares, shares)
-                    if sell_shares > 0:
-                        cash += sell_shares * unit_revenue
-                        shares -= sell_shares
-                        record_fill(
-                            date_str=date_str,
-                            side="SELL",
-                            quantity=float(sell_shares),
-                            open_price=open_price,
-                            fill_price=effective_price,
-                            fee_rate=fee_rate,
-                            reason="rebalance",
-                        )
-                        if shares <= 0:
-                            shares = 0.0
-                            entry_price = None
-                            high_max = None
-                            maybe_close_trade(date_str)
-
-            if had_position_before_open and stop_level is not None and low_price <= stop_level and shares > 0:
-                fill_price = min(open_price, stop_level) if open_price > 0 else stop_level
-                effective_price = fill_price * (1 - slippage_rate)
-                unit_revenue = effective_price * (1 - fee_rate)
-                sell_shares = float(shares)
-                cash += shares * unit_revenue
-                shares = 0.0
+        for row, side, quantity, open_price, fill_price, reason, flat in zip(*(a.tolist() for a in fill_arrays)):
+            date_str = date_strs[row]
+            if side == SIGNAL_BUY:
+                if flat and not trade_open:
+                    trade_open = True
+                    trade_entry_date = date_str
+                    trade_cash_flow = 0.0
+                    trade_buy_cost = 0.0
+                    trade_sell_proceeds = 0.0
+                    trade_fill_count = 0
+                record_fill(
+                    date_str=date_str,
+                    side="BUY",
+                    quantity=quantity,
+                    open_price=open_price,
+                    fill_price=fill_price,
+                    fee_rate=fee_rate,
+                    reason="rebalance",
+                )
+            else:
                 record_fill(
                     date_str=date_str,
                     side="SELL",
-                    quantity=sell_shares,
-                    open_price=float(open_price if open_price > 0 else fill_price),
-                    fill_price=effective_price,
+                    quantity=quantity,
+                    open_price=open_price,
+                    fill_price=fill_price,
                     fee_rate=fee_rate,
-                    reason="stop",
+                    reason="stop" if reason == FILL_STOP else "rebalance",
                 )
-                maybe_close_trade(date_str)
-                entry_price = None
-                high_max = None
-
-            if shares > 0:
-                high_max = max(high_max or high_price, high_price)
-
-            equity = cash + shares * close_price
-            strategy_series.append({"date": date_str, "value": equity / initial_capital})
-            benchmark_series.append({"date": date_str, "value": (close_price / first_close) if first_close else 0.0})
+                if flat:
+                    maybe_close_trade(date_str)
 
-            if return_details:
-                exposure = 0.0 if equity <= 0 else (shares * close_price) / equity
-                daily_details.append(
-                    {
-                        "date": date_str,
-                        "equity": float(equity),
-                        "value": float(equity / initial_capital),
-                        "benchmark_value": float((close_price / first_close) if first_close else 0.0),
-                        "exposure": float(exposure),
-                        "target_exposure": float(target),
-                        "cash": float(cash),
-                        "shares": float(shares),
-                    }
-                )
+        strategy_series, benchmark_series, daily_details = build_series(cash_arr, shares_arr, targets)
 
         out: dict = {"strategy": strategy_series, "benchmark": benchmark_series}
         if return_details:
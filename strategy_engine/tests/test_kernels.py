@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy_engine._kernels import (
+    FILL_REBALANCE,
+    FILL_STOP,
+    SIGNAL_BUY,
+    SIGNAL_SELL,
+    _crossovers,
+    _ewm_mean,
+    _simulate_rebalance,
+)
+from strategy_engine.services import StrategyService
+
+
+def _reference_crossovers(diff, confirm_bars, min_cross_gap):
+    out = []
+    last = {}
+    for i in range(1, len(diff)):
+        if diff[i] > 0 and diff[i - 1] <= 0:
+            kind, held = SIGNAL_BUY, lambda seg: (seg > 0).all()
+        elif diff[i] < 0 and diff[i - 1] >= 0:
+            kind, held = SIGNAL_SELL, lambda seg: (seg < 0).all()
+        else:
+            continue
+        end = i + confirm_bars
+        if end >= len(diff) or not held(diff[i : end + 1]):
+            continue
+        if kind in last and end - last[kind] <= min_cross_gap:
+            continue
+        last[kind] = end
+        out.append((end, kind))
+    return out
+
+
+@pytest.mark.parametrize("confirm_bars,min_cross_gap", [(0, 0), (1, 0), (0, 3), (2, 5)])
+def test_crossovers_match_reference_scan(confirm_bars, min_cross_gap):
+    rng = np.random.default_rng(7)
+    short_ma = rng.normal(size=400).cumsum()
+    long_ma = np.convolve(short_ma, np.ones(5) / 5, mode="same")
+
+    indices, kinds = _crossovers(short_ma, long_ma, confirm_bars, min_cross_gap)
+    expected = _reference_crossovers(short_ma - long_ma, confirm_bars, min_cross_gap)
+    assert list(zip(indices.tolist(), kinds.tolist())) == expected
+    assert expected
+
+
+def test_generate_signals_with_types_matches_signal_type():
+    closes = [1, 2, 1, 2, 1, 10, 1, 10, 1, 10]
+    df = pd.DataFrame(
+        {"date": pd.date_range("2025-01-01", periods=len(closes)).date, "close": [float(c) for c in closes]}
+    )
+    df = StrategyService.calculate_moving_averages(df, 2, 3)
+    signals, types = StrategyService.generate_signals(df, with_types=True)
+    assert signals == StrategyService.generate_signals(df)
+    assert types.dtype == np.int8
+    assert [s["signal_type"] for s in signals] == ["BUY" if t == SIGNAL_BUY else "SELL" for t in types.tolist()]
+
+
+@pytest.mark.parametrize("alpha,min_periods", [(0.5, 1), (2.0 / 13.0, 12), (1.0 / 14.0, 14)])
+def test_ewm_mean_matches_pandas(alpha, min_periods):
+    values = np.random.default_rng(3).normal(size=300) + 100.0
+    values[[0, 1, 40, 41, 42, 150]] = np.nan
+    expected = pd.Series(values).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean().to_numpy()
+    np.testing.assert_allclose(_ewm_mean(values, alpha, min_periods), expected, rtol=1e-12, equal_nan=True)
+
+
+def test_calculate_macd_matches_pandas_ewm():
+    close = pd.Series(np.random.default_rng(4).normal(size=120).cumsum() + 50.0)
+
+    dif, dea = StrategyService.calculate_macd(pd.DataFrame({"close": close}))
+
+    def ema(series, span):
+        return series.ewm(span=span, adjust=False, min_periods=span).mean()
+
+    expected_dif = ema(close, 12) - ema(close, 26)
+    pd.testing.assert_series_equal(dif, expected_dif, rtol=1e-12, check_names=False)
+    pd.testing.assert_series_equal(dea, ema(expected_dif, 9), rtol=1e-12, check_names=False)
+
+
+def test_simulate_rebalance_chandelier_stop_fills_at_stop_level():
+    opens = np.array([10.0, 10.0, 12.0, 11.0, 11.0])
+    closes = np.array([10.0, 12.0, 12.0, 11.0, 11.0])
+    highs = closes + 0.5
+    lows = np.array([9.5, 9.5, 11.8, 9.0, 10.5])
+    targets = np.array([0.0, 1.0, 1.0, 1.0, 0.0])
+    prev_atr = np.full(5, 0.5)
+
+    equity, cash, shares, fills = _simulate_rebalance(
+        opens, closes, highs, lows, targets, prev_atr, 100.0, 0.0, 0.0, True, True, 2.0, False, 0.0
+    )
+
+    rows, sides, quantities, open_prices, fill_prices, reasons, flat = fills
+    assert rows.tolist() == [1, 3]
+    assert sides.tolist() == [SIGNAL_BUY, SIGNAL_SELL]
+    assert reasons.tolist() == [FILL_REBALANCE, FILL_STOP]
+    assert flat.tolist() == [True, True]
+    # high_max is 12.5 after bar 2, so the stop sits at 12.5 - 2 * 0.5 = 11.5 and the
+    # bar-3 open of 11.0 has already gapped through it.
+    assert fill_prices[1] == 11.0
+    assert quantities[0] == quantities[1] == 10.0
+    assert shares.tolist() == [0.0, 10.0, 10.0, 0.0, 0.0]
+    assert equity.tolist() == [100.0, 120.0, 120.0, 110.0, 110.0]
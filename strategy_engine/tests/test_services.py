@@ -1,9 +1,10 @@
 from datetime import date, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from market_data.services import StockDataService
+from market_data.services import StockDataService, _parse_dates
 from strategy_engine.services import StrategyService
 
 
@@ -27,6 +28,25 @@ def test_calculate_moving_averages_basic():
     assert out["ma_long"].isna().sum() == 4
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_sma_signals_match_rolling_mean_baseline(seed):
+    # Cent-rounded random walk with a flat tail: exact MA ties must stay ties, or the
+    # crossover scan emits extra/shifted signals.
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, 300)), 2)
+    close[-60:] = close[-61]
+    df = pd.DataFrame({"date": [date(2020, 1, 1) + timedelta(days=i) for i in range(len(close))], "close": close})
+
+    baseline = df.assign(
+        ma_short=df["close"].rolling(window=5, min_periods=5).mean(),
+        ma_long=df["close"].rolling(window=20, min_periods=20).mean(),
+    )
+    actual = StrategyService.calculate_moving_averages(df, 5, 20)
+
+    pd.testing.assert_frame_equal(actual[["ma_short", "ma_long"]], baseline[["ma_short", "ma_long"]], check_exact=True)
+    assert StrategyService.generate_signals(actual) == StrategyService.generate_signals(baseline)
+
+
 @pytest.mark.django_db
 def test_generate_signals_cross_over():
     df = pd.DataFrame(
@@ -122,6 +142,14 @@ def test_calculate_adx_returns_0_to_100():
     assert (tail <= 100).all()
 
 
+def test_naive_datetime_strings_match_timestamp_isoformat():
+    dates = pd.Series(pd.to_datetime(["2024-01-02", "2024-01-03 04:05:06"], format="ISO8601"))
+    assert StrategyService._naive_datetime_strings(dates) == [d.isoformat() for d in dates]
+    assert StrategyService._naive_datetime_strings(dates + pd.Timedelta("500ms")) is None
+    assert StrategyService._naive_datetime_strings(dates.dt.tz_localize("UTC")) is None
+    assert StrategyService._naive_datetime_strings(dates.dt.date) is None
+
+
 @pytest.mark.django_db
 def test_calculate_performance_default_dma_returns_series():
     df = pd.DataFrame(
@@ -208,6 +236,81 @@ def test_read_price_csv_repo_format(tmp_path):
     assert df.iloc[0]["date"] == date(2025, 1, 1)
 
 
+@pytest.mark.parametrize(
+    "csv_text",
+    [
+        "date,open,high,low,close,volume\n2025-01-02,2,3,1.5,2.5,200\n2025-01-01,1,2,0.5,1.5,100\n",
+        "Price,Close,High,Low,Open,Volume\nTicker,T,T,T,T,T\nDate,,,,,\n2025-01-01,1.5,2,0.5,1,100\n",
+        "Date,Open,High,Low,Close,Volume\n2025-01-01,1,2,0.5,,100\n,1,1,1,1,1\n2025-01-02,2,3,1.5,2.5,\n",
+    ],
+)
+def test_arrow_csv_parser_matches_pandas_path(monkeypatch, tmp_path, csv_text):
+    pytest.importorskip("pyarrow")
+    from market_data import services
+
+    p = tmp_path / "TEST.csv"
+    p.write_text(csv_text)
+    fast = StockDataService._parse_price_csv_arrow(p)
+    assert fast is not None
+
+    monkeypatch.setattr(services, "pacsv", None)
+    pd.testing.assert_frame_equal(fast, StockDataService._parse_price_csv(p))
+
+
+@pytest.mark.parametrize("use_arrow", [True, False])
+def test_parse_price_csv_skips_unused_columns(monkeypatch, tmp_path, use_arrow):
+    from market_data import services
+
+    if use_arrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(services, "pacsv", None)
+    p = tmp_path / "TEST.csv"
+    p.write_text(
+        "Price,Adj Close,Close,High,Low,Open,Volume,Dividends\n"
+        "Ticker,T,T,T,T,T,T,T\n"
+        "Date,,,,,,,\n"
+        "2025-01-01,1.4,1.5,2,0.5,1,100,0\n"
+    )
+
+    df = StockDataService._parse_price_csv(p)
+    assert list(df.columns) == ["date", "close", "high", "low", "open", "volume"]
+    assert df.iloc[0]["close"] == 1.5
+
+
+def test_read_price_csv_cache_round_trips_and_invalidates_on_rewrite(settings, tmp_path):
+    import os
+
+    settings.PRICE_CSV_CACHE_SECONDS = 60
+    p = tmp_path / "TEST.csv"
+    p.write_text("date,open,high,low,close,volume\n2025-01-02,2,3,1.5,2.5,200\n2025-01-01,1,2,0.5,1.5,100\n")
+
+    first = StockDataService.read_price_csv(p)
+    second = StockDataService.read_price_csv(p)
+    pd.testing.assert_frame_equal(first, second)
+    assert second.iloc[0]["date"] == date(2025, 1, 1)
+
+    p.write_text("date,open,high,low,close,volume\n2025-01-03,3,4,2.5,3.5,300\n")
+    st = os.stat(p)
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    third = StockDataService.read_price_csv(p)
+    assert third["date"].tolist() == [date(2025, 1, 3)]
+
+
+def test_read_price_csv_in_process_memo_skips_shared_cache(settings, tmp_path, monkeypatch):
+    from market_data import services
+
+    settings.PRICE_CSV_CACHE_SECONDS = 60
+    p = tmp_path / "MEMO.csv"
+    p.write_text("date,open,high,low,close,volume\n2025-01-01,1,2,0.5,1.5,100\n")
+
+    first = StockDataService.read_price_csv(p)
+    first.loc[0, "close"] = -1.0
+    monkeypatch.setattr(services.cache, "get", lambda *_a, **_k: pytest.fail("shared cache consulted"))
+    second = StockDataService.read_price_csv(p)
+    assert second.loc[0, "close"] == 1.5
+
+
 @pytest.mark.django_db
 def test_should_refresh_only_when_range_missing(settings):
     settings.AUTO_REFRESH_ON_REQUEST = True
@@ -245,3 +348,191 @@ def test_should_refresh_only_when_range_missing(settings):
     )
     assert should is True
     assert reason == "start_date_before_min_date"
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["2024-01-02", "2024-01-03", None],
+        ["2024-01-02 00:00:00", "bad", "2024-01-04"],
+        ["2024-01-02", "01/03/2024", "Jan 4 2024"],
+    ],
+)
+def test_parse_dates_matches_mixed_parser(values):
+    raw = pd.Series(values, dtype=object)
+    expected = pd.to_datetime(raw, errors="coerce", format="mixed")
+    pd.testing.assert_series_equal(_parse_dates(raw), expected)
+
+
+@pytest.mark.parametrize("code", ["AAPL", " 600519 ", "BRK.B", "BF-B", "a_b"])
+def test_validate_code_accepts_safe_codes(code):
+    assert StockDataService._validate_code(code) == code.strip()
+
+
+@pytest.mark.parametrize("code", ["", "  ", "A/B", "../x", "股票", "AAPL\u0661"])
+def test_validate_code_rejects_unsafe_codes(code):
+    with pytest.raises(ValueError):
+        StockDataService._validate_code(code)
+
+
+def test_resolve_csv_path_memoizes_hits_per_directory_mtime(tmp_path):
+    import os
+
+    from market_data.services import _resolve_csv_path_cached
+
+    (tmp_path / "AAPL_3y.csv").write_text("date,open,high,low,close,volume\n")
+    _resolve_csv_path_cached.cache_clear()
+    assert StockDataService.resolve_csv_path("AAPL", data_dir=tmp_path).name == "AAPL_3y.csv"
+    assert StockDataService.resolve_csv_path("AAPL", data_dir=tmp_path).name == "AAPL_3y.csv"
+    assert _resolve_csv_path_cached.cache_info().hits == 1
+
+    (tmp_path / "AAPL.csv").write_text("date,open,high,low,close,volume\n")
+    st = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert StockDataService.resolve_csv_path("AAPL", data_dir=tmp_path).name == "AAPL.csv"
+
+    with pytest.raises(FileNotFoundError):
+        StockDataService.resolve_csv_path("MSFT", data_dir=tmp_path)
+
+
+def test_resolve_csv_path_shares_one_directory_scan(tmp_path):
+    from market_data.services import _data_dir_file_names, _resolve_csv_path_cached
+
+    for name in ("AAPL.csv", "MSFT_3y.csv", "notes.txt"):
+        (tmp_path / name).write_text("date,open,high,low,close,volume\n")
+    _resolve_csv_path_cached.cache_clear()
+    _data_dir_file_names.cache_clear()
+
+    assert StockDataService.resolve_csv_path("AAPL", data_dir=tmp_path).name == "AAPL.csv"
+    assert StockDataService.resolve_csv_path("msft", data_dir=tmp_path).name == "MSFT_3y.csv"
+    assert _data_dir_file_names.cache_info().misses == 1
+    with pytest.raises(FileNotFoundError):
+        StockDataService.resolve_csv_path("GOOG", data_dir=tmp_path)
+
+
+@pytest.mark.parametrize(
+    "start,end",
+    [
+        (date(2025, 1, 3), date(2025, 1, 5)),
+        (None, date(2024, 1, 1)),
+        (date(2025, 2, 1), None),
+        (date(2024, 1, 1), date(2026, 1, 1)),
+        (None, None),
+    ],
+)
+def test_slice_date_range_matches_boolean_masks(start, end):
+    df = pd.DataFrame({"date": [date(2025, 1, d) for d in range(1, 11)], "close": range(10)})
+    expected = df
+    if start:
+        expected = expected[expected["date"] >= start]
+    if end:
+        expected = expected[expected["date"] <= end]
+    pd.testing.assert_frame_equal(StockDataService._slice_date_range(df, start, end), expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize(
+    "incoming_days",
+    [
+        [4, 5],  # pure append
+        [2, 3, 4],  # overlapping tail
+        [1, 3, 4],  # overlap with a hole: day 2 must survive (general path)
+        [0, 2, 3],  # hole in an overlap ending on the last stored date
+        [0, 1],  # backfill (general path)
+        [5, 1, 5, -1],  # unsorted with an internal duplicate (general path)
+    ],
+)
+def test_merge_and_write_csv_matches_full_merge(tmp_path, incoming_days):
+    def frame(days, close):
+        return pd.DataFrame(
+            {
+                "date": [date(2025, 1, 1) + timedelta(days=d) for d in days],
+                "open": [1.0] * len(days),
+                "high": [2.0] * len(days),
+                "low": [0.5] * len(days),
+                "close": [close] * len(days),
+                "volume": [100] * len(days),
+            }
+        )
+
+    p = tmp_path / "TEST.csv"
+    existing = frame([0, 1, 2, 3], 1.5)
+    existing.to_csv(p, index=False)
+    incoming = frame(incoming_days, 9.0)
+
+    merged = StockDataService._merge_and_write_csv(p, existing, incoming)
+    expected = (
+        pd.concat([existing, incoming], ignore_index=True)
+        .drop_duplicates(subset=["date"], keep="last")
+        .sort_values("date")
+        .reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(merged, expected)
+    pd.testing.assert_frame_equal(StockDataService._parse_price_csv(p), expected)
+
+
+@pytest.mark.parametrize("incoming_days", [[2, 3], [1, 2]])  # append / overlapping rewrite
+def test_merge_and_write_csv_keeps_extra_columns(tmp_path, incoming_days):
+    p = tmp_path / "TEST.csv"
+    p.write_text(
+        "date,open,high,low,close,adj close,volume\n"
+        "2025-01-01,1,2,0.5,1.5,1.4,100\n"
+        "2025-01-02,1,2,0.5,1.5,1.4,100\n"
+    )
+    existing = StockDataService._parse_price_csv(p)
+    incoming = pd.DataFrame(
+        {
+            "date": [date(2025, 1, 1) + timedelta(days=d) for d in incoming_days],
+            "open": [3.0] * 2,
+            "high": [4.0] * 2,
+            "low": [2.5] * 2,
+            "close": [3.5] * 2,
+            "volume": [300] * 2,
+        }
+    )
+
+    merged = StockDataService._merge_and_write_csv(p, existing, incoming)
+
+    assert list(merged.columns) == ["date", "open", "high", "low", "close", "volume"]
+    reread = StockDataService._parse_price_csv(p)
+    pd.testing.assert_frame_equal(reread, merged, check_dtype=False)
+    assert reread["volume"].tolist()[-2:] == [300, 300]
+    full = StockDataService._parse_price_csv(p, all_columns=True)
+    assert "adj close" in full.columns
+    assert full["adj close"].iloc[0] == 1.4
+
+
+def test_read_price_csv_uses_feather_sidecar(settings, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    settings.PRICE_CSV_CACHE_SECONDS = 0
+    settings.PRICE_FEATHER_CACHE = True
+    p = tmp_path / "TEST.csv"
+    p.write_text("Date,Open,High,Low,Close,Volume\n2025-01-01,1,2,0.5,1.5,100\n2025-01-02,2,3,1.5,2.5,\n")
+
+    first = StockDataService.read_price_csv(p)
+    assert len(list((tmp_path / "cache").glob("TEST__*.feather"))) == 1
+
+    def fail(_path):
+        raise AssertionError("CSV should not be re-parsed")
+
+    monkeypatch.setattr(StockDataService, "_parse_price_csv", staticmethod(fail))
+    pd.testing.assert_frame_equal(StockDataService.read_price_csv(p), first)
+
+
+@pytest.mark.django_db
+def test_should_refresh_claims_cooldown_once(settings):
+    from django.core.cache import cache
+
+    settings.AUTO_REFRESH_ON_REQUEST = True
+    settings.AUTO_REFRESH_COOLDOWN_SECONDS = 60
+    cache.delete("stock_refresh:COOL")
+    kwargs = dict(
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 2, 1),
+        min_date=date(2025, 1, 1),
+        max_date=date(2025, 1, 10),
+        force_refresh=False,
+    )
+
+    assert StockDataService._should_refresh("COOL", **kwargs) == (True, "end_date_after_max_date")
+    assert StockDataService._should_refresh("COOL", **kwargs) == (False, "cooldown")
+    cache.delete("stock_refresh:COOL")
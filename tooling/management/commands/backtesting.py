@@ -11,10 +11,15 @@ from __future__ import annotations
 import csv
 import json
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timezone
+from itertools import repeat
 from pathlib import Path
 from typing import Optional
 
+import pandas as pd
+
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.utils.dateparse import parse_date
@@ -24,6 +29,49 @@ from strategy_engine.backtest_metrics import summarize_segment
 from strategy_engine.services import StrategyService
 
 
+def _run_backtest(df: pd.DataFrame, short_window: int, long_window: int, perf_kwargs: dict) -> dict:
+    """Run a single backtest for one symbol/variant and return full details.
+
+    Args:
+        df: Price frame for the symbol (already clipped to the evaluation range).
+        short_window: Short moving-average window.
+        long_window: Long moving-average window.
+        perf_kwargs: Keyword arguments for `StrategyService.calculate_performance(...)`.
+    Returns:
+        Output from `StrategyService.calculate_performance(...)`, including `details`.
+    """
+    df_ma = StrategyService.calculate_moving_averages(df, short_window=short_window, long_window=long_window)
+    return StrategyService.calculate_performance(df_ma, **perf_kwargs)
+
+
+def _run_grid_point(
+    df: pd.DataFrame,
+    short_window: int,
+    long_window: int,
+    perf_kwargs: dict,
+    segment_kwargs: dict,
+) -> Optional[tuple[dict, dict]]:
+    """Run one grid-search candidate and summarize its IS segment.
+
+    Module-level so it can be dispatched to a process pool (`--workers`).
+
+    Returns:
+        `(out, is_metrics)`, or `None` if the backtest failed.
+    """
+    try:
+        out = _run_backtest(df, short_window, long_window, perf_kwargs)
+        details = out.get("details") or {}
+        seg = summarize_segment(
+            daily=details.get("daily", []),
+            fills=details.get("fills", []),
+            closed_trades=details.get("closed_trades", []),
+            **segment_kwargs,
+        )
+    except Exception:
+        return None
+    return out, seg
+
+
 class Command(BaseCommand):
     """Run IS/OOS research evaluation and write artifacts.
 
@@ -235,6 +283,12 @@ class Command(BaseCommand):
             choices=["sharpe", "calmar", "cagr"],
             help="Metric used to pick parameters on IS during grid search.",
         )
+        parser.add_argument(
+            "--workers",
+            default=1,
+            type=int,
+            help="Processes used to evaluate grid-search candidates (default: 1; 0 = one per CPU).",
+        )
 
         parser.add_argument("--fee-rate", default=0.001, type=float)
         parser.add_argument("--slippage-rate", default=0.0005, type=float)
@@ -304,6 +358,10 @@ class Command(BaseCommand):
         long_grid = self._parse_int_csv(options.get("long_grid"), field_name="long_grid")
         grid_search: bool = bool(options.get("grid_search", False))
         search_metric: str = str(options.get("search_metric") or "sharpe")
+        workers = int(options.get("workers", 1))
+        if workers < 0:
+            raise CommandError("workers must be >= 0")
+        workers = workers or (os.cpu_count() or 1)
 
         fee_rate = float(options.get("fee_rate") or 0.0)
         slippage_rate = float(options.get("slippage_rate") or 0.0)
@@ -436,119 +494,111 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Backtesting run_id={run_id} symbols={len(symbols)} variants={variants} -> {run_dir}")
 
-        for raw_symbol in symbols:
-            symbol = (raw_symbol or "").strip()
-            if not symbol:
-                continue
-
-            try:
-                code = StockDataService._validate_code(symbol).upper()
-                csv_path = StockDataService.resolve_csv_path(code, data_dir=data_dir)
-                df = StockDataService.read_price_csv(csv_path)
+        # Grid candidates are CPU-bound pure-Python backtests; fan them out across processes.
+        executor = ProcessPoolExecutor(max_workers=workers) if grid_search and workers > 1 else None
+        try:
+            for raw_symbol in symbols:
+                symbol = (raw_symbol or "").strip()
+                if not symbol:
+                    continue
+
+                try:
+                    code = StockDataService._validate_code(symbol).upper()
+                    csv_path = StockDataService.resolve_csv_path(code, data_dir=data_dir)
+                    df = StockDataService.read_price_csv(csv_path)
+                    if df.empty:
+                        raise ValueError("CSV contains no rows")
+                except Exception as exc:
+                    raise CommandError(
+                        f"{symbol}: failed to load CSV ({exc}).\n"
+                        f"Next:\n"
+                        f"- Put a normalized CSV under {data_dir} with columns date,open,high,low,close,volume\n"
+                        f"- Or download via: python manage.py yfinance_batch_csv --symbols {symbol} --canonical-start 2010-01-01\n"
+                        f"- Or point to a different folder via: --data-dir <path>"
+                    ) from exc
+
+                # read_price_csv returns rows sorted by date, so the bounds are the end rows.
+                csv_min = df["date"].iloc[0]
+                csv_max = df["date"].iloc[-1]
+                effective_end = oos_end or csv_max  # If no explicit OOS end, evaluate up to the last available bar.
+
+                df = StockDataService._slice_date_range(df, is_start, effective_end)
                 if df.empty:
-                    raise ValueError("CSV contains no rows")
-            except Exception as exc:
-                raise CommandError(
-                    f"{symbol}: failed to load CSV ({exc}).\n"
-                    f"Next:\n"
-                    f"- Put a normalized CSV under {data_dir} with columns date,open,high,low,close,volume\n"
-                    f"- Or download via: python manage.py yfinance_batch_csv --symbols {symbol} --canonical-start 2010-01-01\n"
-                    f"- Or point to a different folder via: --data-dir <path>"
-                ) from exc
-
-            csv_min = df["date"].min()
-            csv_max = df["date"].max()
-            effective_end = oos_end or csv_max  # If no explicit OOS end, evaluate up to the last available bar.
-
-            df = df[(df["date"] >= is_start) & (df["date"] <= effective_end)].reset_index(drop=True)
-            if df.empty:
-                raise CommandError(
-                    f"{code}: no rows in requested range {is_start.isoformat()}..{effective_end.isoformat()} "
-                    f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
-                    f"Next: download/prepare data covering that range, or adjust --is-start/--is-end/--oos-start/--oos-end."
-                )
-
-            has_is = bool(((df["date"] >= is_start) & (df["date"] <= is_end)).any())
-            has_oos = bool(((df["date"] >= oos_start) & (df["date"] <= effective_end)).any())
-
-            if grid_search and not has_is:
-                raise CommandError(
-                    f"{code}: grid search requires IS data, but IS has zero bars in {is_start.isoformat()}..{is_end.isoformat()} "
-                    f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
-                    f"Next:\n"
-                    f"- Download longer history: python manage.py yfinance_batch_csv --symbols {code} --canonical-start 2010-01-01\n"
-                    f"- Or adjust split: --is-start/--is-end (keep is_end < oos_start)\n"
-                    f"- Or disable --grid-search"
-                )
-
-            if not has_is and not allow_empty_is:
-                raise CommandError(
-                    f"{code}: IS segment has zero bars in {is_start.isoformat()}..{is_end.isoformat()} "
-                    f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
-                    f"Next:\n"
-                    f"- Download longer history: python manage.py yfinance_batch_csv --symbols {code} --canonical-start 2010-01-01\n"
-                    f"- Or adjust split: --is-start/--is-end/--oos-start/--oos-end (keep is_end < oos_start)\n"
-                    f"- If you intentionally want to run OOS only: pass --allow-empty-is"
-                )
-
-            if not has_oos and not allow_empty_oos:
-                raise CommandError(
-                    f"{code}: OOS segment has zero bars in {oos_start.isoformat()}..{effective_end.isoformat()} "
-                    f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
-                    f"Next:\n"
-                    f"- Prepare newer data (so CSV max >= oos_start)\n"
-                    f"- Or adjust split: --oos-start/--oos-end\n"
-                    f"- If you intentionally want to run IS only: pass --allow-empty-oos"
-                )
-
-            for variant in variants:
-                variant_kwargs = dict(variant_defs[variant])
-
-                def run_one(short_window: int, long_window: int) -> dict:
-                    """Run a single backtest for this symbol/variant and return full details.
-
-                    Args:
-                        short_window: Short moving-average window.
-                        long_window: Long moving-average window.
-                    Returns:
-                        Output from `StrategyService.calculate_performance(...)`, including
-                        `details` when `return_details=True`.
-                    """
-                    df_ma = StrategyService.calculate_moving_averages(df, short_window=short_window, long_window=long_window)
-                    return StrategyService.calculate_performance(
-                        df_ma,
-                        initial_capital=100.0,
-                        fee_rate=fee_rate,
-                        slippage_rate=slippage_rate,
-                        allow_fractional=True,
-                        confirm_bars=confirm_bars,
-                        min_cross_gap=min_cross_gap,
-                        return_details=True,
-                        **variant_kwargs,
+                    raise CommandError(
+                        f"{code}: no rows in requested range {is_start.isoformat()}..{effective_end.isoformat()} "
+                        f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
+                        f"Next: download/prepare data covering that range, or adjust --is-start/--is-end/--oos-start/--oos-end."
                     )
 
-                chosen_short = 5
-                chosen_long = 20
-                best_out: Optional[dict] = None
-                grid_rows: list[dict] = []
+                has_is = bool(((df["date"] >= is_start) & (df["date"] <= is_end)).any())
+                has_oos = bool(((df["date"] >= oos_start) & (df["date"] <= effective_end)).any())
+
+                if grid_search and not has_is:
+                    raise CommandError(
+                        f"{code}: grid search requires IS data, but IS has zero bars in {is_start.isoformat()}..{is_end.isoformat()} "
+                        f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
+                        f"Next:\n"
+                        f"- Download longer history: python manage.py yfinance_batch_csv --symbols {code} --canonical-start 2010-01-01\n"
+                        f"- Or adjust split: --is-start/--is-end (keep is_end < oos_start)\n"
+                        f"- Or disable --grid-search"
+                    )
 
-                if grid_search:
-                    best_score = float("-inf")
-                    for s in short_grid:
-                        for l in long_grid:
-                            if s >= l:
+                if not has_is and not allow_empty_is:
+                    raise CommandError(
+                        f"{code}: IS segment has zero bars in {is_start.isoformat()}..{is_end.isoformat()} "
+                        f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
+                        f"Next:\n"
+                        f"- Download longer history: python manage.py yfinance_batch_csv --symbols {code} --canonical-start 2010-01-01\n"
+                        f"- Or adjust split: --is-start/--is-end/--oos-start/--oos-end (keep is_end < oos_start)\n"
+                        f"- If you intentionally want to run OOS only: pass --allow-empty-is"
+                    )
+
+                if not has_oos and not allow_empty_oos:
+                    raise CommandError(
+                        f"{code}: OOS segment has zero bars in {oos_start.isoformat()}..{effective_end.isoformat()} "
+                        f"(CSV range {csv_min.isoformat()}..{csv_max.isoformat()}).\n"
+                        f"Next:\n"
+                        f"- Prepare newer data (so CSV max >= oos_start)\n"
+                        f"- Or adjust split: --oos-start/--oos-end\n"
+                        f"- If you intentionally want to run IS only: pass --allow-empty-oos"
+                    )
+
+                for variant in variants:
+                    perf_kwargs = {
+                        "initial_capital": 100.0,
+                        "fee_rate": fee_rate,
+                        "slippage_rate": slippage_rate,
+                        "allow_fractional": True,
+                        "confirm_bars": confirm_bars,
+                        "min_cross_gap": min_cross_gap,
+                        "return_details": True,
+                        **variant_defs[variant],
+                    }
+
+                    chosen_short = 5
+                    chosen_long = 20
+                    best_out: Optional[dict] = None
+                    grid_rows: list[dict] = []
+
+                    if grid_search:
+                        best_score = float("-inf")
+                        pairs = [(s, l) for s in short_grid for l in long_grid if s < l]
+                        segment_kwargs = {"start": is_start, "end": is_end, "trading_days_per_year": trading_days_per_year}
+                        # Candidates are independent; results come back in grid order either way.
+                        mapper = executor.map if executor is not None else map
+                        results = mapper(
+                            _run_grid_point,
+                            repeat(df),
+                            [s for s, _ in pairs],
+                            [l for _, l in pairs],
+                            repeat(perf_kwargs),
+                            repeat(segment_kwargs),
+                        )
+                        for (s, l), result in zip(pairs, results):
+                            if result is None:
                                 continue
+                            out, seg = result
                             try:
-                                out = run_one(s, l)
-                                details = out.get("details") or {}
-                                seg = summarize_segment(
-                                    daily=details.get("daily", []),
-                                    fills=details.get("fills", []),
-                                    closed_trades=details.get("closed_trades", []),
-                                    start=is_start,
-                                    end=is_end,
-                                    trading_days_per_year=trading_days_per_year,
-                                )
                                 score = float(seg.get(search_metric))
                                 if score != score:
                                     score = float("-inf")
@@ -575,77 +625,80 @@ class Command(BaseCommand):
                             except Exception:
                                 continue
 
-                    self._write_rows_csv(grid_dir / f"{code}__{variant}__grid.csv", grid_rows)
-
-                if best_out is None:
-                    try:
-                        best_out = run_one(chosen_short, chosen_long)
-                    except Exception as exc:
-                        failures.append((f"{code}:{variant}", str(exc)))
-                        self.stderr.write(f"[FAIL] {code} {variant}: {exc}")
-                        continue
-
-                details = best_out.get("details") or {}
-                daily = details.get("daily", [])
-                fills = details.get("fills", [])
-                closed_trades = details.get("closed_trades", [])
-
-                is_metrics = summarize_segment(
-                    daily=daily,
-                    fills=fills,
-                    closed_trades=closed_trades,
-                    start=is_start,
-                    end=is_end,
-                    trading_days_per_year=trading_days_per_year,
-                )
-                oos_metrics = summarize_segment(
-                    daily=daily,
-                    fills=fills,
-                    closed_trades=closed_trades,
-                    start=oos_start,
-                    end=oos_end,
-                    trading_days_per_year=trading_days_per_year,
-                )
-
-                summary_rows.append(
-                    self._format_row_for_csv(
-                        {
-                            "code": code,
-                            "variant": variant,
-                            "short_window": chosen_short,
-                            "long_window": chosen_long,
-                            "is_bars": is_metrics.get("bars"),
-                            "is_cagr": is_metrics.get("cagr"),
-                            "is_mdd": is_metrics.get("mdd"),
-                            "is_sharpe": is_metrics.get("sharpe"),
-                            "is_calmar": is_metrics.get("calmar"),
-                            "is_turnover": is_metrics.get("turnover"),
-                            "is_avg_exposure": is_metrics.get("avg_exposure"),
-                            "is_trades": is_metrics.get("trades"),
-                            "is_win_rate": is_metrics.get("win_rate"),
-                            "is_pl_ratio": is_metrics.get("pl_ratio"),
-                            "oos_bars": oos_metrics.get("bars"),
-                            "oos_cagr": oos_metrics.get("cagr"),
-                            "oos_mdd": oos_metrics.get("mdd"),
-                            "oos_sharpe": oos_metrics.get("sharpe"),
-                            "oos_calmar": oos_metrics.get("calmar"),
-                            "oos_turnover": oos_metrics.get("turnover"),
-                            "oos_avg_exposure": oos_metrics.get("avg_exposure"),
-                            "oos_trades": oos_metrics.get("trades"),
-                            "oos_win_rate": oos_metrics.get("win_rate"),
-                            "oos_pl_ratio": oos_metrics.get("pl_ratio"),
-                        }
+                        self._write_rows_csv(grid_dir / f"{code}__{variant}__grid.csv", grid_rows)
+
+                    if best_out is None:
+                        try:
+                            best_out = _run_backtest(df, chosen_short, chosen_long, perf_kwargs)
+                        except Exception as exc:
+                            failures.append((f"{code}:{variant}", str(exc)))
+                            self.stderr.write(f"[FAIL] {code} {variant}: {exc}")
+                            continue
+
+                    details = best_out.get("details") or {}
+                    daily = details.get("daily", [])
+                    fills = details.get("fills", [])
+                    closed_trades = details.get("closed_trades", [])
+
+                    is_metrics = summarize_segment(
+                        daily=daily,
+                        fills=fills,
+                        closed_trades=closed_trades,
+                        start=is_start,
+                        end=is_end,
+                        trading_days_per_year=trading_days_per_year,
+                    )
+                    oos_metrics = summarize_segment(
+                        daily=daily,
+                        fills=fills,
+                        closed_trades=closed_trades,
+                        start=oos_start,
+                        end=oos_end,
+                        trading_days_per_year=trading_days_per_year,
+                    )
+
+                    summary_rows.append(
+                        self._format_row_for_csv(
+                            {
+                                "code": code,
+                                "variant": variant,
+                                "short_window": chosen_short,
+                                "long_window": chosen_long,
+                                "is_bars": is_metrics.get("bars"),
+                                "is_cagr": is_metrics.get("cagr"),
+                                "is_mdd": is_metrics.get("mdd"),
+                                "is_sharpe": is_metrics.get("sharpe"),
+                                "is_calmar": is_metrics.get("calmar"),
+                                "is_turnover": is_metrics.get("turnover"),
+                                "is_avg_exposure": is_metrics.get("avg_exposure"),
+                                "is_trades": is_metrics.get("trades"),
+                                "is_win_rate": is_metrics.get("win_rate"),
+                                "is_pl_ratio": is_metrics.get("pl_ratio"),
+                                "oos_bars": oos_metrics.get("bars"),
+                                "oos_cagr": oos_metrics.get("cagr"),
+                                "oos_mdd": oos_metrics.get("mdd"),
+                                "oos_sharpe": oos_metrics.get("sharpe"),
+                                "oos_calmar": oos_metrics.get("calmar"),
+                                "oos_turnover": oos_metrics.get("turnover"),
+                                "oos_avg_exposure": oos_metrics.get("avg_exposure"),
+                                "oos_trades": oos_metrics.get("trades"),
+                                "oos_win_rate": oos_metrics.get("win_rate"),
+                                "oos_pl_ratio": oos_metrics.get("pl_ratio"),
+                            }
+                        )
                     )
-                )
 
-                self._write_rows_csv(series_dir / f"{code}__{variant}__daily.csv", list(daily))
-                self._write_rows_csv(fills_dir / f"{code}__{variant}__fills.csv", list(fills))
-                self._write_rows_csv(trades_dir / f"{code}__{variant}__trades.csv", list(closed_trades))
+                    self._write_rows_csv(series_dir / f"{code}__{variant}__daily.csv", list(daily))
+                    self._write_rows_csv(fills_dir / f"{code}__{variant}__fills.csv", list(fills))
+                    self._write_rows_csv(trades_dir / f"{code}__{variant}__trades.csv", list(closed_trades))
 
-                self.stdout.write(
-                    f"[OK] {code} {variant} short={chosen_short} long={chosen_long} "
-                    f"IS(sharpe={is_metrics.get('sharpe')}) OOS(sharpe={oos_metrics.get('sharpe')})"
-                )
+                    self.stdout.write(
+                        f"[OK] {code} {variant} short={chosen_short} long={chosen_long} "
+                        f"IS(sharpe={is_metrics.get('sharpe')}) OOS(sharpe={oos_metrics.get('sharpe')})"
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         self._write_rows_csv(run_dir / "summary.csv", summary_rows)
         self.stdout.write(f"Done. rows={len(summary_rows)} failed={len(failures)}")
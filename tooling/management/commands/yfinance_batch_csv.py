@@ -79,30 +79,37 @@ class Command(BaseCommand):
             f"Downloading {len(symbols)} symbol(s) from yfinance (mode={mode}, auto_adjust=true) -> {output_dir}"
         )
 
+        codes: list[tuple[str, str]] = []
         for raw_symbol in symbols:
             symbol = (raw_symbol or "").strip()
             if not symbol:
                 continue
+            try:
+                codes.append((symbol, StockDataService._validate_code(symbol).upper()))
+            except ValueError as exc:
+                failures.append((symbol, str(exc)))
+                self.stderr.write(f"[FAIL] {symbol}: {exc}")
 
+        frames = StockDataService.fetch_yfinance_ohlcv_many(
+            [code for _, code in codes],
+            start_date=canonical_start,
+            end_date=end_date,
+            auto_adjust=True,
+        )
+
+        for symbol, code in codes:
             try:
-                code = StockDataService._validate_code(symbol).upper()
                 out_path = output_dir / f"{code}.csv"
 
-                df = StockDataService.fetch_yfinance_ohlcv(
-                    code,
-                    start_date=canonical_start,
-                    end_date=end_date,
-                    period=period,
-                    auto_adjust=True,
-                )
-                if df.empty:
+                df = frames.get(code)
+                if df is None or df.empty:
                     raise ValueError("yfinance returned no rows after filtering")
 
                 StockDataService.atomic_write_price_csv(out_path, df)
                 written += 1
 
-                min_date = df["date"].min()
-                max_date = df["date"].max()
+                min_date = df["date"].iloc[0]
+                max_date = df["date"].iloc[-1]
                 self.stdout.write(
                     f"[OK] {code} -> {out_path.name} rows={len(df)} range={min_date}..{max_date}"
                 )